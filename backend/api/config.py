@@ -0,0 +1,23 @@
+import os
+
+TRUTHY = {"1", "true", "yes", "on"}
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Boolean setting from the environment ("1", "true", "yes", "on" are true)."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUTHY
+
+
+def env_int(name: str, default: int) -> int:
+    """Integer setting from the environment (unset or blank: `default`)."""
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Float setting from the environment (unset or blank: `default`)."""
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else float(default)
@@ -0,0 +1,141 @@
+import asyncio
+from collections import deque
+from typing import Deque, List, Set, Tuple
+from urllib.parse import parse_qsl, urldefrag, urlencode, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+from .config import env_flag
+from .discovery import ROBOTS_USER_AGENT, discover_urls, load_robots
+from .extraction import PARSE_VERSION
+from .fetcher import fetch_html
+from .http_cache import page_cache
+from .parse_pool import parse_page_async
+
+CRAWL_RESPECT_ROBOTS = env_flag("CRAWL_RESPECT_ROBOTS", True)
+CRAWL_USE_SITEMAPS = env_flag("CRAWL_USE_SITEMAPS", True)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "ref_src",
+}
+
+
+def canonicalize_url(url: str) -> str:
+    """Canonicalize a URL so trivial variants map to one seen-set key (ValueError on a bad port)."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+
+    query = parts.query
+    if query:
+        params = [
+            (k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+            if k not in TRACKING_PARAMS and not k.startswith(TRACKING_PARAM_PREFIXES)
+        ]
+        query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class CrawlFrontier:
+    """FIFO crawl frontier that queues URLs as found and dedups them by canonical key."""
+
+    def __init__(self, start_url: str, robots: RobotFileParser | None = None):
+        start = canonicalize_url(start_url)
+        self.domain = urlsplit(start).netloc
+        self.robots = robots
+        self._queue: Deque[str] = deque([urldefrag(start_url.strip()).url])
+        self._seen: Set[str] = {start}
+
+    def add(self, url: str) -> bool:
+        """Queue a URL if it is http(s), same-domain and not seen before."""
+        try:
+            canonical = canonicalize_url(url)
+        except ValueError:
+            return False
+        parts = urlsplit(canonical)
+        if parts.scheme not in ("http", "https") or parts.netloc != self.domain:
+            return False
+        if canonical in self._seen:
+            return False
+        url = urldefrag(url.strip()).url
+        if self.robots is not None and not self.robots.can_fetch(ROBOTS_USER_AGENT, url):
+            return False
+        self._seen.add(canonical)
+        self._queue.append(url)
+        return True
+
+    def pop(self) -> str:
+        return self._queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+async def load_page(url: str) -> Tuple[dict, List[str]] | None:
+    """Fetch and parse one page, resolving links against the URL after redirects."""
+    fetched = await fetch_html(url)
+    if fetched is None:
+        return None
+    html, not_modified, final_url = fetched
+    if not_modified and page_cache:
+        parsed = page_cache.load_parsed(url, PARSE_VERSION)
+        if parsed is not None:
+            return parsed
+    parsed = await parse_page_async(html, final_url)
+    if parsed is None:
+        return None
+    content, links = parsed
+    if page_cache:
+        page_cache.store_parsed(url, PARSE_VERSION, content, links)
+    return content, links
+
+
+async def crawl_website(start_url: str, max_pages: int = 10) -> List[dict]:
+    """Crawl a website and return structured content for unique, same-domain pages."""
+    pages: List[dict] = []
+    start_page = None
+    try:
+        # The start page is fetched whatever robots.txt says, so it loads
+        # while robots.txt and the sitemaps are still being read
+        frontier = CrawlFrontier(start_url)
+        start_page = asyncio.create_task(load_page(frontier.pop()))
+        if CRAWL_RESPECT_ROBOTS:
+            frontier.robots = await load_robots(start_url)
+        if CRAWL_USE_SITEMAPS:
+            # Over-fetch candidates so failed pages are replaced by the next-ranked ones
+            for url in await discover_urls(start_url, frontier.robots, limit=max_pages * 2):
+                frontier.add(url)
+
+        loaded = [await start_page]
+        while True:
+            for parsed in loaded:
+                if parsed is None or len(pages) >= max_pages:
+                    continue
+                content, links = parsed
+                pages.append(content)
+                for full_url in links:
+                    frontier.add(full_url)
+
+            if not frontier or len(pages) >= max_pages:
+                break
+            wave: List[str] = []
+            while frontier and len(wave) < max_pages - len(pages):
+                wave.append(frontier.pop())
+            loaded = await asyncio.gather(*(load_page(url) for url in wave))
+
+        return pages
+    except Exception as e:
+        print(f"Crawler failed for {start_url}: {e}")
+        return pages
+    finally:
+        if start_page is not None and not start_page.done():
+            start_page.cancel()
@@ -74,6 +74,10 @@ class DatabaseService:
     def get_analysis(analysis_id: str) -> dict | None:
         return analysis_db.get(analysis_id)
     
+    @staticmethod
+    def list_analyses(statuses: tuple) -> List[str]:
+        return [analysis_id for analysis_id, data in analysis_db.items() if data.get("status") in statuses]
+
     @staticmethod
     def update_analysis(analysis_id: str, updates: Dict[str, Any]) -> dict | None:
         if analysis_id in analysis_db:
@@ -81,6 +85,15 @@ class DatabaseService:
             return analysis_db[analysis_id]
         return None
     
+    @staticmethod
+    def get_report(analysis_id: str) -> dict | None:
+        return reports_db.get(analysis_id)
+
+    @staticmethod
+    def save_report(analysis_id: str, report_data: dict) -> dict:
+        reports_db[analysis_id] = report_data
+        return report_data
+
     @staticmethod
     # Steps-related methods removed
     
@@ -0,0 +1,142 @@
+import asyncio
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Iterator, List, Tuple
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+from .config import env_int
+from .fetcher import fetch_bytes
+
+SITEMAP_MAX_FILES = env_int("SITEMAP_MAX_FILES", 6)
+SITEMAP_MAX_URLS = env_int("SITEMAP_MAX_URLS", 5000)
+# Only this much of each sitemap (decompressed) is read; URLs past it are ignored
+SITEMAP_MAX_BYTES = env_int("SITEMAP_MAX_BYTES", 4 * 1024 * 1024)
+SITEMAP_CHUNK_BYTES = 64 * 1024
+ROBOTS_MAX_BYTES = 512 * 1024
+ROBOTS_USER_AGENT = "*"
+
+
+def priority_score(url: str) -> int:
+    """Rank a URL by how likely it is to carry answer-engine-relevant content."""
+    url_lower = url.lower()
+    if any(kw in url_lower for kw in ['faq', 'questions']):
+        return 100
+    elif any(kw in url_lower for kw in ['blog', 'article', 'guide', 'resource', 'help', 'docs']):
+        return 80
+    elif any(kw in url_lower for kw in ['product', 'service', 'solutions']):
+        return 70
+    elif any(kw in url_lower for kw in ['about', 'team', 'company']):
+        return 60
+    elif any(kw in url_lower for kw in ['contact', 'location']):
+        return 40
+    else:
+        return 10  # default low priority
+
+
+async def load_robots(start_url: str) -> RobotFileParser | None:
+    """Fetch and parse robots.txt for the site; None when it is unavailable."""
+    parts = urlsplit(start_url)
+    robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+    body = await fetch_bytes(robots_url, ROBOTS_MAX_BYTES)
+    if body is None:
+        return None
+    robots = RobotFileParser(robots_url)
+    robots.parse(body.decode("utf-8", errors="replace").splitlines())
+    return robots
+
+
+def _xml_chunks(data: bytes) -> Iterator[bytes]:
+    """Yield sitemap XML in chunks, gunzipping sitemap.xml.gz up to SITEMAP_MAX_BYTES of output."""
+    if not data.startswith(b"\x1f\x8b"):
+        for offset in range(0, len(data), SITEMAP_CHUNK_BYTES):
+            yield data[offset:offset + SITEMAP_CHUNK_BYTES]
+        return
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    size = 0
+    while data and size < SITEMAP_MAX_BYTES:
+        chunk = decompressor.decompress(data, min(SITEMAP_CHUNK_BYTES, SITEMAP_MAX_BYTES - size))
+        data = decompressor.unconsumed_tail
+        if not chunk:
+            break
+        size += len(chunk)
+        yield chunk
+
+
+def parse_sitemap(data: bytes, max_urls: int = SITEMAP_MAX_URLS) -> Tuple[List[str], List[str]]:
+    """Incrementally parse a sitemap or sitemap index into (child_sitemaps, page_urls); blocking."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    locs: List[str] = []
+    for chunk in _xml_chunks(data):
+        parser.feed(chunk)
+        for event, el in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = el
+                continue
+            if el.tag.rsplit("}", 1)[-1] == "loc":
+                loc = (el.text or "").strip()
+                if loc:
+                    locs.append(loc)
+        if root is not None:
+            # Drop finished <url>/<sitemap> entries so memory stays flat
+            root.clear()
+        if len(locs) >= max_urls:
+            break
+    locs = locs[:max_urls]
+    if root is not None and root.tag.rsplit("}", 1)[-1] == "sitemapindex":
+        return locs, []
+    return [], locs
+
+
+async def _load_sitemap(sitemap_url: str, max_urls: int) -> Tuple[List[str], List[str]]:
+    body = await fetch_bytes(sitemap_url, SITEMAP_MAX_BYTES, truncate=True)
+    if not body:
+        return [], []
+    try:
+        return await asyncio.to_thread(parse_sitemap, body, max_urls)
+    except (ET.ParseError, zlib.error) as e:
+        print(f"Could not parse sitemap {sitemap_url}: {e}")
+        return [], []
+
+
+async def collect_sitemap_urls(start_url: str, robots: RobotFileParser | None) -> List[str]:
+    """Walk sitemap indexes breadth-first and return page URLs in sitemap order."""
+    parts = urlsplit(start_url)
+    pending = (robots.site_maps() if robots else None) or [
+        urljoin(f"{parts.scheme}://{parts.netloc}", "/sitemap.xml")
+    ]
+    seen = set()
+    page_urls: List[str] = []
+
+    while pending and len(seen) < SITEMAP_MAX_FILES and len(page_urls) < SITEMAP_MAX_URLS:
+        batch = [u for u in dict.fromkeys(pending) if u not in seen][:SITEMAP_MAX_FILES - len(seen)]
+        pending = []
+        seen.update(batch)
+        remaining = SITEMAP_MAX_URLS - len(page_urls)
+        for children, urls in await asyncio.gather(*(_load_sitemap(u, remaining) for u in batch)):
+            pending.extend(children)
+            page_urls.extend(urls)
+
+    return page_urls[:SITEMAP_MAX_URLS]
+
+
+async def discover_urls(start_url: str, robots: RobotFileParser | None, limit: int) -> List[str]:
+    """Return up to `limit` robots-allowed, same-domain sitemap URLs, most AEO-relevant first."""
+    if limit <= 0:
+        return []
+    domain = urlsplit(start_url).netloc.lower()
+    candidates = [
+        u for u in await collect_sitemap_urls(start_url, robots)
+        if urlsplit(u).netloc.lower() == domain
+        and (robots is None or robots.can_fetch(ROBOTS_USER_AGENT, u))
+    ]
+
+    def rank(item: Tuple[int, str]):
+        index, url = item
+        depth = len([seg for seg in urlsplit(url).path.split("/") if seg])
+        return (-priority_score(url), depth, index)
+
+    ranked = sorted(enumerate(dict.fromkeys(candidates)), key=rank)
+    return [url for _, url in ranked[:limit]]
@@ -0,0 +1,83 @@
+import os
+from collections import OrderedDict
+from typing import Tuple
+
+
+class DiskLRUStore:
+    """Size-bounded directory of entries (one file per suffix), evicted least recently used first."""
+
+    def __init__(self, directory: str, max_bytes: int, suffixes: Tuple[str, ...] = (".json",)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffixes = suffixes
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def path(self, key: str, suffix: str | None = None) -> str:
+        return os.path.join(self.directory, key + (suffix or self.suffixes[0]))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _load_index(self) -> None:
+        sizes = {}
+        mtimes = {}
+        for name in os.listdir(self.directory):
+            suffix = next((s for s in self.suffixes if name.endswith(s)), None)
+            if suffix is None:
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            key = name[: -len(suffix)]
+            sizes[key] = sizes.get(key, 0) + st.st_size
+            if suffix == self.suffixes[0] or key not in mtimes:
+                mtimes[key] = st.st_mtime
+        for key in sorted(sizes, key=mtimes.__getitem__):
+            self._index[key] = sizes[key]
+            self.total_bytes += sizes[key]
+
+    def touch(self, key: str) -> None:
+        self._index.move_to_end(key)
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+
+    def remove(self, key: str) -> None:
+        self.total_bytes -= self._index.pop(key, 0)
+        for suffix in self.suffixes:
+            try:
+                os.remove(self.path(key, suffix))
+            except OSError:
+                pass
+
+    def put(self, key: str, data: bytes, suffix: str | None = None) -> int:
+        """Write one file of `key` and evict down to max_bytes; returns entries evicted."""
+        path = self.path(key, suffix)
+        try:
+            old_size = os.path.getsize(path) if key in self._index else 0
+        except OSError:
+            old_size = 0
+        try:
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            self.remove(key)
+            raise
+        size = self._index.pop(key, 0) - old_size + len(data)
+        self._index[key] = size
+        self.total_bytes += len(data) - old_size
+        evicted = 0
+        while self.total_bytes > self.max_bytes and len(self._index) > 1:
+            self.remove(next(iter(self._index)))
+            evicted += 1
+        return evicted
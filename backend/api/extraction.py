@@ -0,0 +1,256 @@
+import json
+import os
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from .fingerprint import simhash
+
+# Optional C-accelerated parsers; html.parser (pure Python) is always available
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    LexborHTMLParser = None
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Bump whenever the shape or content of parse_page output changes; memoized
+# parse results from older versions are then ignored.
+EXTRACTOR_VERSION = "2"
+
+# Per-field caps that keep prompts small
+MAX_TITLE_CHARS = 180
+MAX_HEADINGS = 12
+MAX_PARAGRAPHS = 8
+MAX_LIST_ITEMS = 12
+MAX_META = 12
+MAX_JSONLD_TYPES = 12
+MAX_LINK_TEXTS = 30
+
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+# Parser backends, fastest first. "auto" picks the first one installed.
+PARSER_BACKENDS = ("selectolax", "lxml", "html.parser")
+
+
+def available_backends() -> List[str]:
+    installed = {"selectolax": SELECTOLAX_AVAILABLE, "lxml": LXML_AVAILABLE, "html.parser": True}
+    return [name for name in PARSER_BACKENDS if installed[name]]
+
+
+def resolve_backend(name: str) -> str:
+    """Map a configured backend name to an installed one, falling back in speed order."""
+    available = available_backends()
+    if name in available:
+        return name
+    if name not in ("auto", ""):
+        print(f"HTML parser backend '{name}' unavailable, using '{available[0]}'")
+    return available[0]
+
+
+HTML_PARSER = resolve_backend(os.environ.get("HTML_PARSER", "auto").strip().lower())
+
+# Memoized parses are only valid for the backend that produced them
+PARSE_VERSION = f"{EXTRACTOR_VERSION}:{HTML_PARSER}"
+
+
+def _collect_jsonld_types(node: Any, out: List[str]) -> None:
+    if isinstance(node, dict):
+        node_type = node.get("@type")
+        if isinstance(node_type, str):
+            out.append(node_type)
+        elif isinstance(node_type, list):
+            for t in node_type:
+                if isinstance(t, str):
+                    out.append(t)
+        # @graph may contain multiple nodes
+        if "@graph" in node and isinstance(node["@graph"], list):
+            for child in node["@graph"]:
+                _collect_jsonld_types(child, out)
+    elif isinstance(node, list):
+        for item in node:
+            _collect_jsonld_types(item, out)
+
+
+class PageCollector:
+    """Accumulates capped page fields during a single document-order walk."""
+
+    def __init__(self, url: str, text: Callable[[Any], str]):
+        self.url = url
+        self.text = text
+        self.title: str | None = None
+        self.headings: List[str] = []
+        self.paragraphs: List[str] = []
+        self.lists: List[str] = []
+        self.meta_tags: Dict[str, str] = {}
+        self.jsonld_types: Dict[str, None] = {}
+        self.links_text: List[str] = []
+        self.links: List[str] = []
+
+    @property
+    def jsonld_full(self) -> bool:
+        return len(self.jsonld_types) >= MAX_JSONLD_TYPES
+
+    def heading(self, node: Any) -> None:
+        if len(self.headings) < MAX_HEADINGS:
+            self.headings.append(self.text(node))
+
+    def paragraph(self, node: Any) -> None:
+        if len(self.paragraphs) < MAX_PARAGRAPHS:
+            self.paragraphs.append(self.text(node))
+
+    def list_item(self, node: Any) -> None:
+        if len(self.lists) < MAX_LIST_ITEMS:
+            self.lists.append(self.text(node))
+
+    def anchor(self, node: Any, href: str | None) -> None:
+        """Record an <a>; `href` is None when the attribute is absent."""
+        if href is None:
+            return
+        if len(self.links_text) < MAX_LINK_TEXTS:
+            txt = self.text(node)
+            if txt:
+                self.links_text.append(txt.lower())
+        if href:
+            full_url = urljoin(self.url, href)
+            if urlparse(full_url).scheme in ("http", "https"):
+                self.links.append(full_url)
+
+    def meta(self, key: str | None, value: str | None) -> None:
+        if key and value and (key in self.meta_tags or len(self.meta_tags) < MAX_META):
+            self.meta_tags[key] = value
+
+    def jsonld(self, raw_json: str) -> None:
+        if not raw_json or self.jsonld_full:
+            return
+        try:
+            data = json.loads(raw_json)
+        except Exception:
+            return
+        found: List[str] = []
+        _collect_jsonld_types(data, found)
+        for t in found:
+            self.jsonld_types.setdefault(t, None)
+
+    def set_title(self, string: str | None) -> None:
+        """First <title> in document order wins."""
+        if self.title is None:
+            self.title = string[:MAX_TITLE_CHARS] if string else ""
+
+    def result(self) -> Tuple[dict, List[str]]:
+        return {
+            "url": self.url,
+            "title": self.title or "",
+            "headings": self.headings,
+            "paragraphs": self.paragraphs,
+            "lists": self.lists,
+            "meta": self.meta_tags,
+            "jsonld_types": list(self.jsonld_types)[:MAX_JSONLD_TYPES],
+            "links_text": self.links_text,
+        }, self.links
+
+
+def _bs4_text(el: Tag) -> str:
+    return el.get_text(strip=True)
+
+
+def _parse_bs4(html: str, url: str, features: str) -> Tuple[dict, List[str]]:
+    soup = BeautifulSoup(html, features)
+    c = PageCollector(url, _bs4_text)
+    for el in soup.descendants:
+        if not isinstance(el, Tag):
+            continue
+        name = el.name
+        if name in HEADING_TAGS:
+            c.heading(el)
+        elif name == "p":
+            c.paragraph(el)
+        elif name == "li":
+            c.list_item(el)
+        elif name == "a":
+            c.anchor(el, el.get("href"))
+        elif name == "meta":
+            c.meta(el.get("name") or el.get("property"), el.get("content"))
+        elif name == "script":
+            if not c.jsonld_full and el.get("type") == "application/ld+json":
+                c.jsonld(el.get_text(strip=True))
+        elif name == "title":
+            c.set_title(el.string)
+    return c.result()
+
+
+def _selectolax_text(node: Any) -> str:
+    return node.text(deep=True, separator="", strip=True)
+
+
+def _parse_selectolax(html: str, url: str) -> Tuple[dict, List[str]]:
+    tree = LexborHTMLParser(html)
+    c = PageCollector(url, _selectolax_text)
+
+    # JSON-LD first: script/style are then stripped so element text matches
+    # BeautifulSoup's get_text, which skips them.
+    for script in tree.css("script"):
+        if c.jsonld_full:
+            break
+        if script.attributes.get("type") == "application/ld+json":
+            c.jsonld(script.text(deep=True, separator="", strip=True))
+    tree.strip_tags(["script", "style"])
+
+    root = tree.root
+    if root is None:
+        return c.result()
+    for node in root.traverse():
+        name = node.tag
+        if name in HEADING_TAGS:
+            c.heading(node)
+        elif name == "p":
+            c.paragraph(node)
+        elif name == "li":
+            c.list_item(node)
+        elif name == "a":
+            attrs = node.attributes
+            # Valueless attributes come back as None; BeautifulSoup reports ""
+            c.anchor(node, (attrs["href"] or "") if "href" in attrs else None)
+        elif name == "meta":
+            attrs = node.attributes
+            c.meta(attrs.get("name") or attrs.get("property"), attrs.get("content"))
+        elif name == "title":
+            c.set_title(node.text(deep=True, separator="", strip=False))
+    return c.result()
+
+
+def parse_page(html: str, url: str, backend: str | None = None) -> Tuple[dict, List[str]]:
+    """Parse a fetched page once, returning (structured_content, outgoing_links).
+
+    Structured content captures:
+    - title, headings, paragraphs, lists
+    - meta name/property -> content
+    - jsonld_types: list of JSON-LD @type strings (e.g., FAQPage, HowTo, Article)
+    - links_text: list of anchor texts (lowercased) to detect supporting pages
+    - fingerprint: SimHash of headings and paragraphs for near-duplicate
+      detection (see fingerprint.simhash), or None for near-empty pages
+    """
+    backend = resolve_backend(backend) if backend else HTML_PARSER
+    try:
+        if backend == "selectolax":
+            content, links = _parse_selectolax(html, url)
+        else:
+            content, links = _parse_bs4(html, url, backend)
+        content["fingerprint"] = simhash(content)
+        return content, links
+    except Exception as e:
+        print(f"Error extracting content from {url}: {e}")
+        return {}, []
+
+
+def extract_structured_content(html: str, url: str, backend: str | None = None) -> dict:
+    """Extract the structured-content dict from raw HTML (see parse_page)."""
+    return parse_page(html, url, backend)[0]
@@ -0,0 +1,191 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Mapping, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from .config import env_flag, env_float, env_int
+from .http_cache import page_cache
+
+# Optional extras: h2 enables HTTP/2, brotli enables br transfer decoding
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+CRAWL_CONCURRENCY = env_int("CRAWL_CONCURRENCY", 16)
+CRAWL_PER_HOST_CONCURRENCY = env_int("CRAWL_PER_HOST_CONCURRENCY", 4)
+FETCH_TIMEOUT = env_float("FETCH_TIMEOUT", 10)
+FETCH_CONNECT_TIMEOUT = env_float("FETCH_CONNECT_TIMEOUT", 5)
+FETCH_POOL_SIZE = env_int("FETCH_POOL_SIZE", 100)
+FETCH_POOL_KEEPALIVE = env_int("FETCH_POOL_KEEPALIVE", 20)
+FETCH_KEEPALIVE_EXPIRY = env_float("FETCH_KEEPALIVE_EXPIRY", 30)
+FETCH_MAX_HTML_BYTES = env_int("FETCH_MAX_HTML_BYTES", 2 * 1024 * 1024)
+FETCH_HTTP2 = env_flag("FETCH_HTTP2", True)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/91.0.4472.124 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate",
+}
+
+
+class HostLimiter:
+    """Per-host concurrency limit shared by every crawl in the process."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._users: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def acquire(self, host: str):
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.limit)
+        self._users[host] = self._users.get(host, 0) + 1
+        try:
+            async with semaphore:
+                yield
+        finally:
+            # Drop idle hosts so the table does not grow with every domain analyzed
+            self._users[host] -= 1
+            if not self._users[host]:
+                del self._users[host]
+                del self._semaphores[host]
+
+
+_global_limit = asyncio.Semaphore(CRAWL_CONCURRENCY)
+_host_limit = HostLimiter(CRAWL_PER_HOST_CONCURRENCY)
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(FETCH_TIMEOUT, connect=FETCH_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=FETCH_POOL_SIZE,
+                max_keepalive_connections=FETCH_POOL_KEEPALIVE,
+                keepalive_expiry=FETCH_KEEPALIVE_EXPIRY,
+            ),
+            http2=FETCH_HTTP2 and HTTP2_AVAILABLE,
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _decode(body: bytes, content_type: str) -> str:
+    charset = "utf-8"
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "charset" and value:
+            charset = value.strip('"\' ')
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+async def _stream(
+    url: str,
+    headers: Dict[str, str],
+    content_types: Tuple[str, ...],
+    max_bytes: int,
+    truncate: bool,
+) -> Tuple[httpx.Response, bytes | None]:
+    """Stream a GET; the body is None when its Content-Type or decoded size is rejected."""
+    async with get_http_client().stream("GET", url, headers=headers) as response:
+        if response.status_code == 304:
+            return response, b""
+        response.raise_for_status()
+
+        content_type = response.headers.get("content-type", "")
+        if content_types and not any(ct in content_type for ct in content_types):
+            return response, None
+        declared = response.headers.get("content-length", "")
+        if not truncate and declared.isdigit() and int(declared) > max_bytes:
+            return response, None
+
+        chunks: List[bytes] = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > max_bytes:
+                if not truncate:
+                    return response, None
+                break
+        return response, b"".join(chunks)[:max_bytes]
+
+
+async def _get(
+    url: str,
+    content_types: Tuple[str, ...] = (),
+    max_bytes: int = FETCH_MAX_HTML_BYTES,
+    truncate: bool = False,
+) -> Tuple[bytes, Mapping[str, str], bool, str] | None:
+    """GET under the global and per-host limits: (body, headers, not_modified, final_url) or None."""
+    host = urlparse(url).netloc
+    conditional = page_cache.conditional_headers(url) if page_cache else {}
+    try:
+        async with _global_limit, _host_limit.acquire(host):
+            response, body = await _stream(url, conditional, content_types, max_bytes, truncate)
+            if response.status_code == 304:
+                cached = page_cache.load(url) if page_cache and conditional else None
+                if cached is not None:
+                    return cached[0], cached[1], True, str(response.url)
+                # Cached body vanished: fall back to a plain GET
+                response, body = await _stream(url, {}, content_types, max_bytes, truncate)
+    except httpx.HTTPError as e:
+        print(f"Could not fetch {url}: {e}")
+        return None
+
+    if body is None:
+        return None
+    if page_cache:
+        if conditional:
+            page_cache.record_miss()
+        page_cache.store(url, response.headers, body)
+    return body, response.headers, False, str(response.url)
+
+
+async def fetch_html(url: str) -> Tuple[str, bool, str] | None:
+    """Fetch a URL and return (html_text, not_modified, final_url), or None for non-HTML/failures."""
+    result = await _get(url, content_types=("text/html",), max_bytes=FETCH_MAX_HTML_BYTES, truncate=True)
+    if result is None:
+        return None
+    body, headers, not_modified, final_url = result
+    content_type = headers.get('content-type', '')
+    if 'text/html' not in content_type:
+        return None
+    return _decode(body, content_type), not_modified, final_url
+
+
+async def fetch_bytes(url: str, max_bytes: int, truncate: bool = False) -> bytes | None:
+    """Fetch a URL under the global and per-host limits; None if it fails or exceeds max_bytes."""
+    result = await _get(url, max_bytes=max_bytes, truncate=truncate)
+    return result[0] if result is not None else None
@@ -0,0 +1,96 @@
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List
+
+from .config import env_flag, env_int
+from .utils import ratio
+
+NEAR_DUP_ENABLED = env_flag("NEAR_DUP_ENABLED", True)
+# Pages whose fingerprints differ in at most this many of 64 bits are near-duplicates
+NEAR_DUP_MAX_DISTANCE = env_int("NEAR_DUP_MAX_DISTANCE", 6)
+
+SIMHASH_BITS = 64
+SHINGLE_WORDS = 3
+# Fingerprints over fewer shingles are too noisy to compare
+MIN_SHINGLES = 8
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _shingles(texts: Iterable[Any]) -> List[str]:
+    words = [w.casefold() for text in texts if text for w in _WORD.findall(str(text))]
+    if len(words) < SHINGLE_WORDS:
+        return []
+    return [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+
+
+def simhash(content: dict) -> int | None:
+    """64-bit SimHash of a page's headings and paragraphs, or None for near-empty pages."""
+    shingles = _shingles([*(content.get("headings") or []), *(content.get("paragraphs") or [])])
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def find_near_duplicates(pages: List[dict], max_distance: int = NEAR_DUP_MAX_DISTANCE) -> List[int | None]:
+    """For each page, the index of the first page of its near-duplicate group, else None."""
+    duplicate_of: List[int | None] = [None] * len(pages)
+    if not NEAR_DUP_ENABLED:
+        return duplicate_of
+    representatives: List[int] = []
+    for i, content in enumerate(pages):
+        fingerprint = content.get("fingerprint")
+        if fingerprint is None:
+            continue
+        match = next(
+            (r for r in representatives if hamming_distance(fingerprint, pages[r]["fingerprint"]) <= max_distance),
+            None,
+        )
+        if match is None:
+            representatives.append(i)
+        else:
+            duplicate_of[i] = match
+    return duplicate_of
+
+
+def dedup_summary(duplicate_of: List[int | None]) -> Dict[str, Any]:
+    """Analysis metadata for a find_near_duplicates result."""
+    duplicates = sum(1 for d in duplicate_of if d is not None)
+    return {
+        "pages": len(duplicate_of),
+        "near_duplicates": duplicates,
+        "dedup_ratio": ratio(duplicates, len(duplicate_of)),
+    }
+
+
+class DedupStats:
+    """Running totals of pages scored and near-duplicates that reused a result."""
+
+    def __init__(self):
+        self.pages = 0
+        self.near_duplicates = 0
+
+    def record(self, duplicate_of: List[int | None]) -> None:
+        self.pages += len(duplicate_of)
+        self.near_duplicates += sum(1 for d in duplicate_of if d is not None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": NEAR_DUP_ENABLED,
+            "max_distance": NEAR_DUP_MAX_DISTANCE,
+            "pages": self.pages,
+            "near_duplicates": self.near_duplicates,
+            "dedup_ratio": ratio(self.near_duplicates, self.pages),
+        }
+
+
+dedup_stats = DedupStats()
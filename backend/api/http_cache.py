@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Mapping, Tuple
+
+from .config import env_flag, env_int
+from .disk_store import DiskLRUStore
+from .utils import ratio
+
+HTTP_CACHE_ENABLED = env_flag("HTTP_CACHE_ENABLED", True)
+# The cache is off unless a directory is set; on an in-memory filesystem
+# (Cloud Run) its size counts against the memory limit
+HTTP_CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", "")
+HTTP_CACHE_MAX_BYTES = env_int("HTTP_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+
+# Response headers kept with each entry
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class HttpCache:
+    """On-disk HTTP cache of validated responses (and their parses), revalidated with conditional GETs."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats_counters = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+        }
+        self._store = DiskLRUStore(directory, max_bytes, suffixes=(".body", ".json"))
+
+    # -- paths -----------------------------------------------------------
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key: str) -> str:
+        return self._store.path(key, ".json")
+
+    def _body_path(self, key: str) -> str:
+        return self._store.path(key, ".body")
+
+    def _read_meta(self, key: str) -> Dict[str, Any] | None:
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # -- public API ------------------------------------------------------
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators to send for `url`, or {} when nothing usable is cached."""
+        self.stats_counters["lookups"] += 1
+        key = self._key(url)
+        meta = self._read_meta(key) if key in self._store else None
+        if not meta:
+            self.stats_counters["misses"] += 1
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Tuple[bytes, Dict[str, str]] | None:
+        """Return (body, stored_headers) after a 304, counting it as a hit."""
+        key = self._key(url)
+        meta = self._read_meta(key)
+        try:
+            with open(self._body_path(key), "rb") as f:
+                body = f.read()
+        except OSError:
+            body = None
+        if meta is None or body is None:
+            self._store.remove(key)
+            return None
+        self._store.touch(key)
+        self.stats_counters["hits"] += 1
+        self.stats_counters["bytes_saved"] += len(body)
+        return body, meta.get("headers", {})
+
+    def record_miss(self) -> None:
+        """Count a revalidation that came back with a new body."""
+        self.stats_counters["misses"] += 1
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes) -> None:
+        """Store a 200 response if it carries validators and allows storage."""
+        if "no-store" in headers.get("cache-control", "").lower():
+            return
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_bytes:
+            return
+
+        key = self._key(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {h: headers[h] for h in STORED_HEADERS if h in headers},
+            "parsed": None,
+        }
+        try:
+            self.stats_counters["evictions"] += self._store.put(key, body, ".body")
+            self.stats_counters["evictions"] += self._store.put(key, json.dumps(meta).encode("utf-8"), ".json")
+        except OSError as e:
+            print(f"Could not cache {url}: {e}")
+            return
+        self.stats_counters["stores"] += 1
+
+    def load_parsed(self, url: str, version: str) -> Tuple[dict, List[str]] | None:
+        """Return the memoized (content, links) for the cached body, if any."""
+        meta = self._read_meta(self._key(url))
+        parsed = (meta or {}).get("parsed")
+        if not parsed or parsed.get("version") != version:
+            return None
+        return parsed["content"], parsed["links"]
+
+    def store_parsed(self, url: str, version: str, content: dict, links: List[str]) -> None:
+        """Attach the parse result to an existing cache entry."""
+        key = self._key(url)
+        if key not in self._store:
+            return
+        meta = self._read_meta(key)
+        if meta is None:
+            return
+        meta["parsed"] = {"version": version, "content": content, "links": links}
+        try:
+            self.stats_counters["evictions"] += self._store.put(key, json.dumps(meta).encode("utf-8"), ".json")
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        counters = dict(self.stats_counters)
+        lookups = counters["lookups"]
+        return {
+            **counters,
+            "hit_rate": ratio(counters["hits"], lookups),
+            "entries": len(self._store),
+            "size_bytes": self._store.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+page_cache: HttpCache | None = None
+if HTTP_CACHE_ENABLED and HTTP_CACHE_DIR:
+    try:
+        page_cache = HttpCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES)
+    except OSError as e:
+        print(f"HTTP cache disabled: {e}")
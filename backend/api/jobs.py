@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+from .config import env_float, env_int
+from .database import DatabaseService
+
+ANALYSIS_WORKERS = env_int("ANALYSIS_WORKERS", 2)
+ANALYSIS_QUEUE_MAX = env_int("ANALYSIS_QUEUE_MAX", 100)
+ANALYSIS_JOB_TIMEOUT = env_float("ANALYSIS_JOB_TIMEOUT", 600)
+
+# Analysis statuses of a job that has not finished yet
+ACTIVE_STATUSES = ("queued", "crawling", "analyzing", "summarizing")
+
+
+class QueueFullError(RuntimeError):
+    """Raised by enqueue when ANALYSIS_QUEUE_MAX jobs are already waiting."""
+
+
+class JobQueue:
+    """Runs analysis jobs on background worker tasks; job state lives on the analysis record."""
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[None]],
+        workers: int,
+        max_pending: int,
+        timeout: float,
+    ):
+        self.handler = handler
+        self.workers = max(workers, 1)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._queue: asyncio.Queue | None = None
+        self._tasks: List[asyncio.Task] = []
+        self._active: Set[str] = set()
+        self._running = 0
+        self.stats_counters = {"enqueued": 0, "completed": 0, "failed": 0, "timed_out": 0, "recovered": 0}
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        for analysis_id in DatabaseService.list_analyses(ACTIVE_STATUSES):
+            if analysis_id not in self._active:
+                self._put(analysis_id)
+                self.stats_counters["recovered"] += 1
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._active.clear()
+
+    def is_active(self, analysis_id: str) -> bool:
+        return analysis_id in self._active
+
+    def _put(self, analysis_id: str) -> None:
+        self._active.add(analysis_id)
+        self._queue.put_nowait(analysis_id)
+
+    def enqueue(self, analysis_id: str) -> bool:
+        """Queue a job; False when it is already queued or running."""
+        self.start()
+        if analysis_id in self._active:
+            return False
+        if self._queue.qsize() >= self.max_pending:
+            raise QueueFullError(f"{self._queue.qsize()} analysis jobs already waiting")
+        DatabaseService.update_analysis(analysis_id, {
+            "status": "queued",
+            "queued_at": datetime.now(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "error_status": None,
+        })
+        self._put(analysis_id)
+        self.stats_counters["enqueued"] += 1
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            analysis_id = await self._queue.get()
+            self._running += 1
+            DatabaseService.update_analysis(analysis_id, {"started_at": datetime.now()})
+            try:
+                await asyncio.wait_for(self.handler(analysis_id), self.timeout)
+                self.stats_counters["completed"] += 1
+            except asyncio.TimeoutError:
+                self.stats_counters["timed_out"] += 1
+                print(f"Analysis job {analysis_id} timed out after {self.timeout:.0f}s")
+                DatabaseService.update_analysis(analysis_id, {
+                    "status": "failed",
+                    "error": f"Timed out after {self.timeout:.0f}s",
+                })
+            except Exception as e:
+                self.stats_counters["failed"] += 1
+                print(f"Analysis job {analysis_id} failed: {e}")
+                DatabaseService.update_analysis(analysis_id, {
+                    "status": "failed",
+                    "error": getattr(e, "detail", None) or str(e),
+                    "error_status": getattr(e, "status_code", 500),
+                })
+            finally:
+                DatabaseService.update_analysis(analysis_id, {"finished_at": datetime.now()})
+                self._running -= 1
+                self._active.discard(analysis_id)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats_counters,
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": self._running,
+            "max_pending": self.max_pending,
+        }
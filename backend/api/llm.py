@@ -0,0 +1,344 @@
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+from dotenv import load_dotenv
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
+from pydantic import BaseModel
+
+from .config import env_flag, env_float, env_int
+from .prompt_budget import count_tokens
+
+load_dotenv(override=True)
+
+LLM_MODEL_NAME = os.environ.get("OPENAI_MODEL", "gpt-5-nano")
+LLM_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+LLM_CONCURRENCY = env_int("LLM_CONCURRENCY", 5)
+LLM_STRUCTURED_OUTPUT = env_flag("LLM_STRUCTURED_OUTPUT", True)
+LLM_TIMEOUT = env_float("LLM_TIMEOUT", 20)
+LLM_DEADLINE = env_float("LLM_DEADLINE", 45)
+LLM_MAX_RETRIES = env_int("LLM_MAX_RETRIES", 2)
+LLM_RETRY_BASE_DELAY = env_float("LLM_RETRY_BASE_DELAY", 0.5)
+LLM_RETRY_MAX_DELAY = env_float("LLM_RETRY_MAX_DELAY", 4)
+LLM_BREAKER_THRESHOLD = env_int("LLM_BREAKER_THRESHOLD", 5)
+LLM_BREAKER_COOLDOWN = env_float("LLM_BREAKER_COOLDOWN", 30)
+
+# Transient provider errors worth another attempt
+RETRYABLE_ERRORS = (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError, asyncio.TimeoutError)
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised without calling the provider while the circuit breaker is open."""
+
+# Process-wide cap on in-flight completions, shared by every request
+_llm_limit = asyncio.Semaphore(LLM_CONCURRENCY)
+_client: AsyncOpenAI | None = None
+# Cleared when the provider rejects response_format, so later calls skip it
+_structured_supported = LLM_STRUCTURED_OUTPUT
+
+
+class UsageStats:
+    """Token usage per call purpose (score, score_batch, summary, report, ...)."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def record(self, purpose: str, prompt_tokens: int, completion_tokens: int) -> None:
+        totals = self._totals.setdefault(purpose, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+        totals["calls"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        by_purpose = {k: dict(v) for k, v in self._totals.items()}
+        return {
+            "calls": sum(v["calls"] for v in by_purpose.values()),
+            "prompt_tokens": sum(v["prompt_tokens"] for v in by_purpose.values()),
+            "completion_tokens": sum(v["completion_tokens"] for v in by_purpose.values()),
+            "by_purpose": by_purpose,
+        }
+
+
+usage_stats = UsageStats()
+
+
+class CircuitBreaker:
+    """Stops calling the provider after repeated failures, probing again after a cooldown."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = max(threshold, 1)
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.stats_counters = {"trips": 0, "short_circuited": 0, "failures": 0, "retries": 0, "timeouts": 0, "queue_timeouts": 0}
+
+    def available(self) -> bool:
+        """Whether a call would currently be attempted (no state change)."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            return time.monotonic() - self._opened_at >= self.cooldown
+        return not self._probe_in_flight
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.stats_counters["short_circuited"] += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            print("LLM circuit breaker closed")
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe slot without an outcome (e.g. cancellation)."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.stats_counters["failures"] += 1
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.threshold:
+            if self.state != "open":
+                self.stats_counters["trips"] += 1
+                print(f"LLM circuit breaker open for {self.cooldown:.0f}s after {self.consecutive_failures} failures")
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats_counters,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "threshold": self.threshold,
+            "cooldown_seconds": self.cooldown,
+        }
+
+
+breaker = CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_COOLDOWN)
+
+
+def llm_available() -> bool:
+    """True when a client is configured and the breaker would let a call through."""
+    if get_llm_client() is None:
+        return False
+    if not breaker.available():
+        breaker.stats_counters["short_circuited"] += 1
+        return False
+    return True
+
+
+def get_llm_client() -> AsyncOpenAI | None:
+    """Return the shared async client, or None when no API key is configured."""
+    global _client
+    if _client is None:
+        try:
+            _client = AsyncOpenAI(
+                api_key=os.environ.get("OPENAI_API_KEY"),
+                base_url=LLM_BASE_URL,
+                timeout=LLM_TIMEOUT,
+                # Retries are handled in chat() so they count toward the breaker
+                max_retries=0,
+            )
+        except Exception:
+            return None
+    return _client
+
+
+async def close_llm_client() -> None:
+    """Close the shared LLM client."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def structured_output_enabled() -> bool:
+    return _structured_supported
+
+
+def _strict(node: Any) -> None:
+    if isinstance(node, dict):
+        if node.get("type") == "object" and "properties" in node:
+            node["additionalProperties"] = False
+            node["required"] = list(node["properties"])
+        for value in node.values():
+            _strict(value)
+    elif isinstance(node, list):
+        for value in node:
+            _strict(value)
+
+
+def json_schema_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """response_format requesting strict JSON matching a pydantic model."""
+    schema = copy.deepcopy(model.model_json_schema())
+    _strict(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": schema, "strict": True},
+    }
+
+
+def _record_usage(purpose: str, model: str, messages: List[Dict[str, str]], response: Any, reply: str) -> None:
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if prompt_tokens is None:
+        prompt_tokens = sum(count_tokens(m["content"]) for m in messages)
+    if completion_tokens is None:
+        completion_tokens = count_tokens(reply)
+    usage_stats.record(purpose, prompt_tokens, completion_tokens)
+    print(f"LLM call [{purpose}] {model}: {prompt_tokens} prompt + {completion_tokens} completion tokens")
+
+
+def _rejects_response_format(error: BadRequestError) -> bool:
+    """Whether a 400 is about response_format itself (not context length, content filter, model, ...)."""
+    param = str(getattr(error, "param", None) or "")
+    code = str(getattr(error, "code", None) or "")
+    return param.startswith("response_format") or "response_format" in code
+
+
+async def _acquire_slot(deadline: float, purpose: str) -> None:
+    """Wait for a slot under LLM_CONCURRENCY; LLMUnavailableError at `deadline`."""
+    try:
+        await asyncio.wait_for(_llm_limit.acquire(), max(deadline - time.monotonic(), 0))
+    except asyncio.TimeoutError:
+        # Local saturation, not a provider failure: the breaker doesn't count it
+        breaker.stats_counters["queue_timeouts"] += 1
+        raise LLMUnavailableError(f"LLM call [{purpose}] timed out waiting for a concurrency slot") from None
+
+
+async def chat(
+    messages: List[Dict[str, str]],
+    model: str = LLM_MODEL_NAME,
+    response_format: Dict[str, Any] | None = None,
+    purpose: str = "other",
+) -> str:
+    """Send a chat completion with bounded retries and return the reply text."""
+    global _structured_supported
+    client = get_llm_client()
+    if client is None:
+        raise RuntimeError("LLM client not configured")
+    if not breaker.allow():
+        raise LLMUnavailableError("LLM circuit breaker is open")
+
+    deadline = time.monotonic() + LLM_DEADLINE
+    attempt = 0
+    while True:
+        kwargs: Dict[str, Any] = {}
+        if response_format and _structured_supported:
+            kwargs["response_format"] = response_format
+        try:
+            await _acquire_slot(deadline, purpose)
+            try:
+                # Recomputed after the wait: queueing for a slot spends the deadline too
+                timeout = min(LLM_TIMEOUT, deadline - time.monotonic())
+                if timeout <= 0:
+                    # Local queueing, not the provider: must not trip the breaker
+                    breaker.stats_counters["queue_timeouts"] += 1
+                    raise LLMUnavailableError(f"LLM call [{purpose}] got a concurrency slot after its deadline")
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(model=model, messages=messages, **kwargs),
+                    timeout,
+                )
+            finally:
+                _llm_limit.release()
+            break
+        except LLMUnavailableError:
+            breaker.release_probe()
+            raise
+        except BadRequestError as e:
+            if "response_format" not in kwargs or not _rejects_response_format(e):
+                # The provider is up; the request itself was rejected
+                breaker.record_success()
+                raise
+            print(f"Structured output rejected by provider, using plain JSON prompts: {e}")
+            _structured_supported = False
+        except RETRYABLE_ERRORS as e:
+            if isinstance(e, (APITimeoutError, asyncio.TimeoutError)):
+                breaker.stats_counters["timeouts"] += 1
+            delay = random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+            if attempt >= LLM_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                breaker.record_failure()
+                raise
+            attempt += 1
+            breaker.stats_counters["retries"] += 1
+            print(f"LLM call [{purpose}] failed ({type(e).__name__}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+    breaker.record_success()
+    reply = response.choices[0].message.content or ""
+    _record_usage(purpose, model, messages, response, reply)
+    return reply
+
+
+async def complete(prompt: str, model: str = LLM_MODEL_NAME, purpose: str = "other") -> str:
+    """Send a single-message chat completion and return the reply text."""
+    return await chat([{"role": "user", "content": prompt}], model=model, purpose=purpose)
+
+
+async def complete_json(
+    prompt: str,
+    schema: Type[BaseModel],
+    parse: Callable[[str], Tuple[Any, str | None]],
+    model: str = LLM_MODEL_NAME,
+    purpose: str = "other",
+) -> Tuple[Any, str | None, str]:
+    """Request JSON matching `schema` with one repair retry: (value, error, raw)."""
+    response_format = json_schema_format(schema)
+    messages = [{"role": "user", "content": prompt}]
+    raw = await chat(messages, model=model, response_format=response_format, purpose=purpose)
+    value, error = parse(raw)
+    if error is None:
+        return value, None, raw
+
+    messages += [
+        {"role": "assistant", "content": raw},
+        {
+            "role": "user",
+            "content": (
+                f"That reply was invalid: {error[:500]}. "
+                "Return only the corrected JSON, matching the requested shape exactly."
+            ),
+        },
+    ]
+    repaired = await chat(messages, model=model, response_format=response_format, purpose=purpose + "_repair")
+    repaired_value, repaired_error = parse(repaired)
+    if repaired_value is not None or value is None:
+        return repaired_value, repaired_error, repaired
+    return value, error, raw
+
+
+def load_json(raw: str) -> Tuple[Any, str | None]:
+    """Strict JSON decode for structured-output replies: (value, error)."""
+    try:
+        return json.loads(raw), None
+    except ValueError as e:
+        return None, f"not valid JSON ({e})"
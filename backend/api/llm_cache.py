@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict
+
+from .config import env_flag, env_float, env_int
+from .disk_store import DiskLRUStore
+from .utils import ratio
+
+LLM_CACHE_ENABLED = env_flag("LLM_CACHE_ENABLED", True)
+# The cache is off unless a directory is set; on an in-memory filesystem
+# (Cloud Run) its size counts against the memory limit
+LLM_CACHE_DIR = os.environ.get("LLM_CACHE_DIR", "")
+LLM_CACHE_MAX_BYTES = env_int("LLM_CACHE_MAX_BYTES", 4 * 1024 * 1024)
+LLM_CACHE_TTL = env_float("LLM_CACHE_TTL", 7 * 24 * 3600)
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse whitespace in strings so formatting-only changes share a key."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def content_key(content: Any, prompt_version: str, model: str) -> str:
+    """Cache key for an LLM result over `content` with a given prompt and model."""
+    payload = json.dumps(
+        {"content": _normalize(content), "prompt": prompt_version, "model": model},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """On-disk cache of validated LLM results keyed by content_key, expiring after `ttl` seconds."""
+
+    def __init__(self, directory: str, max_bytes: int, ttl: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats_counters = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+        self._store = DiskLRUStore(directory, max_bytes)
+
+    def get(self, key: str) -> Any | None:
+        self.stats_counters["lookups"] += 1
+        entry = None
+        if key in self._store:
+            try:
+                with open(self._store.path(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._store.remove(key)
+        if entry is not None and time.time() - entry.get("created_at", 0) > self.ttl:
+            self._store.remove(key)
+            self.stats_counters["expired"] += 1
+            entry = None
+        if entry is None:
+            self.stats_counters["misses"] += 1
+            return None
+
+        self._store.touch(key)
+        self.stats_counters["hits"] += 1
+        return entry["value"]
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps({"created_at": time.time(), "value": value}).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        try:
+            self.stats_counters["evictions"] += self._store.put(key, data)
+        except OSError as e:
+            print(f"Could not cache LLM result: {e}")
+            return
+        self.stats_counters["stores"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        counters = dict(self.stats_counters)
+        lookups = counters["lookups"]
+        return {
+            **counters,
+            # Each hit is one page-scoring LLM call avoided
+            "hit_rate": ratio(counters["hits"], lookups),
+            "entries": len(self._store),
+            "size_bytes": self._store.total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+        }
+
+
+llm_cache: LLMResultCache | None = None
+if LLM_CACHE_ENABLED and LLM_CACHE_DIR:
+    try:
+        llm_cache = LLMResultCache(LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL)
+    except OSError as e:
+        print(f"LLM result cache disabled: {e}")
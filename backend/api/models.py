@@ -19,6 +19,8 @@ class UserResponse(BaseModel):
 # Analysis and Report models
 class QuickAnalyzeRequest(BaseModel):
     url: str
+    # Skip the quick-analysis result cache (the fresh result is still cached)
+    bypass_cache: bool = False
 
 class ReportRequest(BaseModel):
     url: str
@@ -29,6 +31,12 @@ class ReportStatus(BaseModel):
     status: str
     score: int
     report_url: Optional[str] = None
+    urls_found: Optional[int] = None
+    pages_analyzed: Optional[int] = None
+    queued_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
 
 class AEOReportMeta(BaseModel):
     report_title: str
@@ -124,4 +132,21 @@ class QuickAnalyzeResponse(BaseModel):
     content_quality: CategoryScore
     structure_optimization: CategoryScore
     authority_trust: CategoryScore
-    ai_agent_compatibility: CategoryScore
\ No newline at end of file
+    ai_agent_compatibility: CategoryScore
+
+# LLM structured-output models (scoring prompts)
+class PageScores(BaseModel):
+    content_quality: CategoryScore
+    structure_optimization: CategoryScore
+    authority_trust: CategoryScore
+    ai_agent_compatibility: CategoryScore
+
+class PageScoreResult(BaseModel):
+    scores: PageScores
+
+class BatchPageScore(BaseModel):
+    page: int
+    scores: PageScores
+
+class BatchScoreResult(BaseModel):
+    results: List[BatchPageScore]
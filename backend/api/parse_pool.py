@@ -0,0 +1,120 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Tuple
+
+from .config import env_int
+from .extraction import HTML_PARSER, parse_page
+
+# Each worker process costs ~30 MB RSS, and one is enough on a single
+# vCPU; PARSE_WORKERS=0 parses on the event loop instead.
+PARSE_WORKERS = env_int("PARSE_WORKERS", 1)
+PARSE_MAX_TASKS_PER_CHILD = env_int("PARSE_MAX_TASKS_PER_CHILD", 200)
+PARSE_QUEUE_DEPTH = env_int("PARSE_QUEUE_DEPTH", max(PARSE_WORKERS, 1) * 4)
+
+
+class ParsePool:
+    """Runs parse_page in worker processes with bounded submissions so parsing never blocks the event loop."""
+
+    def __init__(self, workers: int, max_tasks_per_child: int, queue_depth: int):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.queue_depth = max(queue_depth, 1)
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(self.queue_depth)
+        self._retry_lock = asyncio.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self.stats_counters = {"submitted": 0, "completed": 0, "inline": 0, "restarts": 0, "retried": 0, "dropped": 0}
+
+    def _new_executor(self, workers: int) -> ProcessPoolExecutor:
+        # spawn: forking a process that runs an event loop and open sockets is unsafe
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=self.max_tasks_per_child or None,
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self._new_executor(self.workers)
+        return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        # Every parse in flight sees the same breakage; only the first rebuilds
+        if self._executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self.stats_counters["restarts"] += 1
+
+    async def _parse_isolated(self, html: str, url: str) -> Tuple[dict, List[str]]:
+        # One page at a time in its own worker, so a crash there drops only that page
+        async with self._retry_lock:
+            executor = self._new_executor(1)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, parse_page, html, url, HTML_PARSER)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def parse(self, html: str, url: str) -> Tuple[dict, List[str]] | None:
+        """(content, links) for the page, or None when it was dropped after breaking the pool."""
+        if self.workers <= 0:
+            self.stats_counters["inline"] += 1
+            return parse_page(html, url)
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        self.stats_counters["submitted"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                result = await loop.run_in_executor(executor, parse_page, html, url, HTML_PARSER)
+            except BrokenProcessPool as e:
+                self._discard(executor)
+                print(f"Parse pool broken ({e}); retrying {url} in a pool of its own")
+                self.stats_counters["retried"] += 1
+                try:
+                    result = await self._parse_isolated(html, url)
+                except BrokenProcessPool:
+                    print(f"Parsing {url} crashed its worker again; dropping the page")
+                    self.stats_counters["dropped"] += 1
+                    return None
+            self.stats_counters["completed"] += 1
+            return result
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats_counters,
+            "workers": self.workers,
+            "max_tasks_per_child": self.max_tasks_per_child,
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+        }
+
+
+parse_pool = ParsePool(PARSE_WORKERS, PARSE_MAX_TASKS_PER_CHILD, PARSE_QUEUE_DEPTH)
+
+
+async def parse_page_async(html: str, url: str) -> Tuple[dict, List[str]] | None:
+    """Parse a page off the event loop (see ParsePool); same result as parse_page, None if dropped."""
+    return await parse_pool.parse(html, url)
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse pool's worker processes."""
+    parse_pool.shutdown()
@@ -0,0 +1,209 @@
+import asyncio
+import os
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, List
+
+from .config import env_int
+
+# Optional exact tokenizer; without it tokens are estimated from length
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+LLM_PAGE_TOKEN_BUDGET = env_int("LLM_PAGE_TOKEN_BUDGET", 600)
+TOKENIZER_ENCODING = os.environ.get("TOKENIZER_ENCODING", "o200k_base")
+
+# Per-item character caps applied before the token budget
+MAX_ITEM_CHARS = {"headings": 160, "paragraphs": 600, "lists": 160}
+MAX_META_VALUE_CHARS = 300
+# Smallest useful remainder when truncating an item to fit the budget
+MIN_TRUNCATED_TOKENS = 24
+
+# Rendering/verification meta tags that say nothing about the content
+NOISE_META_PREFIXES = (
+    "viewport", "generator", "theme-color", "color-scheme", "format-detection",
+    "referrer", "csrf-", "msapplication-", "apple-mobile-web-app-", "google-site-verification",
+)
+
+# Cross-page boilerplate: strings on at least this many pages and at
+# least half of the pages analyzed together
+BOILERPLATE_MIN_PAGES = 3
+
+_encoding = None
+_encoding_failed = False
+
+
+def load_tokenizer() -> bool:
+    """Load the tiktoken encoding (blocking: may download it); True when it is ready."""
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed and TIKTOKEN_AVAILABLE:
+        try:
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as e:
+            # Encodings are fetched on first use; fall back when offline
+            print(f"Tokenizer unavailable, estimating token counts: {e}")
+            _encoding_failed = True
+    return _encoding is not None
+
+
+async def warm_tokenizer() -> None:
+    """Load the tokenizer on a worker thread (app startup)."""
+    await asyncio.to_thread(load_tokenizer)
+
+
+def _get_encoding():
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token)."""
+    return (len(text) + 3) // 4
+
+
+def count_tokens(text: str) -> int:
+    """Token count for `text` (tiktoken when available, else ~4 chars per token)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return estimate_tokens(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens]).rstrip() + "…"
+    return text[: max_tokens * 4].rstrip() + "…"
+
+
+def _clean(text: Any) -> str:
+    return " ".join(str(text).split()) if text else ""
+
+
+def _key(text: str) -> str:
+    return text.casefold()
+
+
+def find_boilerplate(pages: Iterable[dict]) -> FrozenSet[str]:
+    """Heading/paragraph/list strings repeated across most pages (nav, footer)."""
+    pages = list(pages)
+    threshold = max(BOILERPLATE_MIN_PAGES, (len(pages) + 1) // 2)
+    if len(pages) < threshold:
+        return frozenset()
+    counts: Counter = Counter()
+    for content in pages:
+        seen = {
+            _key(_clean(item))
+            for field in ("headings", "paragraphs", "lists")
+            for item in content.get(field) or []
+        }
+        seen.discard("")
+        counts.update(seen)
+    return frozenset(text for text, n in counts.items() if n >= threshold)
+
+
+def uncompacted_text(content: dict) -> str:
+    """The pre-compaction page block (Python reprs), used to measure savings."""
+    return (
+        f"Title: {content.get('title','')}\n"
+        f"Headings: {content.get('headings', [])}\n"
+        f"Paragraphs: {content.get('paragraphs', [])}\n"
+        f"Lists: {content.get('lists', [])}\n"
+        f"Meta: {content.get('meta', {})}\n"
+    )
+
+
+def compact_page_text(
+    content: dict,
+    boilerplate: FrozenSet[str] = frozenset(),
+    budget: int = LLM_PAGE_TOKEN_BUDGET,
+) -> str:
+    """Serialize a page's prompt fields, deduplicated and in priority order, within a token budget."""
+    link_labels = {_key(_clean(t)) for t in content.get("links_text") or []}
+    seen = set()
+
+    def keep(field: str) -> List[str]:
+        items = []
+        for raw in content.get(field) or []:
+            text = _clean(raw)[: MAX_ITEM_CHARS[field]]
+            key = _key(text)
+            if not text or key in seen or key in boilerplate:
+                continue
+            if field == "lists" and key in link_labels:
+                continue
+            seen.add(key)
+            items.append(text)
+        return items
+
+    title = _clean(content.get("title"))
+    seen.add(_key(title))
+    meta: Dict[str, str] = {}
+    for k, v in (content.get("meta") or {}).items():
+        value = _clean(v)[:MAX_META_VALUE_CHARS]
+        # og:title and friends usually restate the title
+        if k and value and _key(value) not in seen and not str(k).lower().startswith(NOISE_META_PREFIXES):
+            meta[str(k)] = value
+    description_key = next((k for k in meta if k.lower() == "description"), None)
+
+    remaining = budget
+    lines: List[str] = []
+
+    def add(line: str) -> bool:
+        nonlocal remaining
+        cost = count_tokens(line) + 1
+        if cost <= remaining:
+            lines.append(line)
+            remaining -= cost
+            return True
+        if remaining >= MIN_TRUNCATED_TOKENS:
+            lines.append(truncate_to_tokens(line, remaining - 1))
+        remaining = 0
+        return False
+
+    sections = [("Title: ", [title] if title else [])]
+    if description_key:
+        sections.append(("Description: ", [meta.pop(description_key)]))
+    sections += [
+        ("H: ", keep("headings")),
+        ("P: ", keep("paragraphs")),
+        ("L: ", keep("lists")),
+        ("Meta: ", [f"{k}={v}" for k, v in meta.items()]),
+    ]
+    for prefix, items in sections:
+        for item in items:
+            if remaining <= 0 or not add(prefix + item):
+                return "\n".join(lines) + "\n"
+    return "\n".join(lines) + "\n"
+
+
+class CompactionStats:
+    """Running totals of estimated page-block tokens before and after compaction."""
+
+    def __init__(self):
+        self.pages = 0
+        self.raw_tokens = 0
+        self.compact_tokens = 0
+
+    def record(self, raw: str, compact: str) -> None:
+        self.pages += 1
+        self.raw_tokens += estimate_tokens(raw)
+        self.compact_tokens += estimate_tokens(compact)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "raw_tokens": self.raw_tokens,
+            "compact_tokens": self.compact_tokens,
+            "saved_ratio": round(1 - self.compact_tokens / self.raw_tokens, 4) if self.raw_tokens else 0.0,
+            "page_token_budget": LLM_PAGE_TOKEN_BUDGET,
+            "tokenizer": TOKENIZER_ENCODING if _get_encoding() is not None else "estimate",
+        }
+
+
+compaction_stats = CompactionStats()
@@ -0,0 +1,56 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from .config import env_flag, env_float, env_int
+from .utils import ratio
+
+QUICK_CACHE_ENABLED = env_flag("QUICK_CACHE_ENABLED", True)
+QUICK_CACHE_TTL = env_float("QUICK_CACHE_TTL", 600)
+QUICK_CACHE_MAX_ENTRIES = env_int("QUICK_CACHE_MAX_ENTRIES", 256)
+
+
+class TTLCache:
+    """In-memory cache with per-entry expiry and least-recently-used eviction."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max(max_entries, 1)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.stats_counters = {"lookups": 0, "hits": 0, "misses": 0, "expired": 0, "bypassed": 0, "evictions": 0}
+
+    def get(self, key: str) -> Any | None:
+        self.stats_counters["lookups"] += 1
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            self.stats_counters["expired"] += 1
+            entry = None
+        if entry is None:
+            self.stats_counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats_counters["hits"] += 1
+        return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats_counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        counters = dict(self.stats_counters)
+        lookups = counters["lookups"]
+        return {
+            **counters,
+            "hit_rate": ratio(counters["hits"], lookups),
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+        }
+
+
+# QuickAnalyzeResponse payloads and page artifacts by normalized URL
+quick_cache: TTLCache | None = TTLCache(QUICK_CACHE_MAX_ENTRIES, QUICK_CACHE_TTL) if QUICK_CACHE_ENABLED else None
@@ -1,44 +1,60 @@
 from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 import uuid
-from datetime import datetime, timedelta
-import os
-from urllib.parse import urljoin, urlparse
-
-# Import necessary libraries for web scraping and analysis
-import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from urllib.parse import urlparse
+
+# Import necessary libraries for analysis
 import re
 import json
-from typing import Any, Dict, Tuple, List
-from openai import OpenAI
+import asyncio
+import hashlib
+from typing import Any, Dict, FrozenSet, Tuple, List
+from pydantic import ValidationError
 
 load_dotenv(override=True)
 
-# Initialize LLM client
-try:
-    client = OpenAI(
-        api_key=os.environ.get("OPENAI_API_KEY"),
-        base_url="https://api.openai.com/v1"
-    )
-except Exception:
-    client = None
-
-LLM_MODEL_NAME = os.environ.get("OPENAI_MODEL", "gpt-5-nano")
-
 from ..models import (
     QuickAnalyzeRequest, ReportRequest, AnalysisResponse,
     ReportStatus, AEOReport,
     MessageResponse, EmailVerification,
-    QuickAnalyzeResponse, CategoryScore
+    QuickAnalyzeResponse, CategoryScore,
+    PageScoreResult, BatchScoreResult
 )
+from ..config import env_flag, env_float, env_int
 from ..utils import generate_verification_code, send_verification_email
 from ..database import DatabaseService
+from ..crawler import crawl_website, canonicalize_url
+from ..llm import (
+    LLM_MODEL_NAME, complete, complete_json, get_llm_client, llm_available, load_json, structured_output_enabled
+)
+from ..llm_cache import content_key, llm_cache
+from ..routing import ROUTE_SKIP, model_for_route, route_page, routing_stats
+from ..jobs import ANALYSIS_JOB_TIMEOUT, ANALYSIS_QUEUE_MAX, ANALYSIS_WORKERS, JobQueue, QueueFullError
+from ..single_flight import SingleFlight
+from ..quick_cache import quick_cache
+from ..fingerprint import dedup_stats, dedup_summary, find_near_duplicates
+from ..prompt_budget import compact_page_text, compaction_stats, find_boilerplate, uncompacted_text
 # from .auth import verify_email  # not used by frontend flows
 
 router = APIRouter(tags=["analysis"])
 
+# Pages scored per LLM request on full-site paths; 1 disables batching
+LLM_SCORING_BATCH_SIZE = env_int("LLM_SCORING_BATCH_SIZE", 5)
+
+# Page results from a quick analysis younger than this are reused by get_report
+PAGE_ARTIFACT_TTL = env_float("PAGE_ARTIFACT_TTL", 3600)
+
+# Bump when the scoring prompts change so cached LLM results are not reused
+SCORING_PROMPT_VERSION = "2"
+
+# Content fields that reach the scoring prompt (and so the result cache key)
+PROMPT_FIELDS = ("title", "headings", "paragraphs", "lists", "meta")
+
+SCORE_CATEGORIES = ("content_quality", "structure_optimization", "authority_trust", "ai_agent_compatibility")
+
 
 def normalize_url(input_url: str) -> str:
     if not input_url:
@@ -49,162 +65,9 @@ def normalize_url(input_url: str) -> str:
     return url
 
 
-def crawl_website(start_url: str, max_pages: int = 10) -> list[str]:
-    """Crawl a website to find unique, same-domain URLs."""
-    try:
-        parsed_start_url = urlparse(start_url)
-        domain = parsed_start_url.netloc
-        
-        urls_to_visit = [start_url]
-        visited_urls = set()
-        found_urls = []
-
-        while urls_to_visit and len(found_urls) < max_pages:
-            url = urls_to_visit.pop(0)
-            if url in visited_urls:
-                continue
-            
-            visited_urls.add(url)
-            
-            try:
-                headers = {
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/91.0.4472.124 Safari/537.36"
-                    )
-                }
-                response = requests.get(url, timeout=5, headers=headers)
-                response.raise_for_status()
-                
-                if 'text/html' not in response.headers.get('Content-Type', ''):
-                    continue
-
-                found_urls.append(url)
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                for link in soup.find_all('a', href=True):
-                    if not isinstance(link, Tag):
-                        continue
-                    href_val = link.get('href')
-                    if not href_val or not isinstance(href_val, str):
-                        continue
-                    full_url = urljoin(url, href_val)
-                    parsed_full_url = urlparse(full_url)
-                    
-                    if (
-                        parsed_full_url.netloc == domain and
-                        parsed_full_url.scheme in ['http', 'https'] and
-                        full_url not in visited_urls and
-                        full_url not in urls_to_visit
-                    ):
-                        urls_to_visit.append(full_url)
-            except requests.RequestException as e:
-                print(f"Could not crawl {url}: {e}")
-                
-        return found_urls
-    except Exception as e:
-        print(f"Crawler failed for {start_url}: {e}")
-        return [start_url]
-
-
-def extract_structured_content(url: str) -> dict:
-    """Extract structured content from a webpage.
-
-    Captures:
-    - title, headings, paragraphs, lists
-    - meta name/property -> content
-    - jsonld_types: list of JSON-LD @type strings (e.g., FAQPage, HowTo, Article)
-    - links_text: list of anchor texts (lowercased) to detect supporting pages
-    """
-    try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            )
-        }
-        response = requests.get(url, timeout=12, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        headings = [h.get_text(strip=True) for h in soup.find_all(re.compile("^h[1-6]$"))]
-        paragraphs = [p.get_text(strip=True) for p in soup.find_all("p")]
-        lists = [li.get_text(strip=True) for li in soup.find_all("li")]
-        meta_tags = {
-            (m.get("name") or m.get("property")): m.get("content")
-            for m in soup.find_all("meta")
-            if isinstance(m, Tag) and m.get("content") and (m.get("name") or m.get("property"))
-        }
-
-        # Extract JSON-LD @type values
-        jsonld_types: List[str] = []
-        try:
-            for s in soup.find_all("script", type="application/ld+json"):
-                if not isinstance(s, Tag):
-                    continue
-                raw_json = s.get_text(strip=True) if s else None
-                if not raw_json:
-                    continue
-                try:
-                    data = json.loads(raw_json)
-                except Exception:
-                    continue
-
-                def collect_types(node: Any):
-                    if isinstance(node, dict):
-                        node_type = node.get("@type")
-                        if isinstance(node_type, str):
-                            jsonld_types.append(node_type)
-                        elif isinstance(node_type, list):
-                            for t in node_type:
-                                if isinstance(t, str):
-                                    jsonld_types.append(t)
-                        # @graph may contain multiple nodes
-                        if "@graph" in node and isinstance(node["@graph"], list):
-                            for child in node["@graph"]:
-                                collect_types(child)
-                    elif isinstance(node, list):
-                        for item in node:
-                            collect_types(item)
-
-                collect_types(data)
-        except Exception:
-            pass
-
-        # Extract anchor texts for simple supporting page detection
-        links_text: List[str] = []
-        try:
-            for a in soup.find_all("a", href=True):
-                if not isinstance(a, Tag):
-                    continue
-                txt = a.get_text(strip=True)
-                if txt:
-                    links_text.append(txt.lower())
-        except Exception:
-            pass
-
-        # Truncate to keep prompts small
-        return {
-            "url": url,
-            "title": soup.title.string[:180] if soup.title and soup.title.string else "",
-            "headings": headings[:12],
-            "paragraphs": paragraphs[:8],
-            "lists": lists[:12],
-            "meta": {k: meta_tags[k] for k in list(meta_tags.keys())[:12] if k},
-            "jsonld_types": list(dict.fromkeys(jsonld_types))[:12],
-            "links_text": links_text[:30],
-        }
-    except Exception as e:
-        print(f"Error extracting content from {url}: {e}")
-        return {}
-
-
-def summarize_reports(summaries: list[str], url: str) -> str:
+async def summarize_reports(summaries: list[str], url: str) -> str:
     """Use LLM to create a high-level summary from individual page summaries."""
-    if not client or not summaries:
+    if not llm_available() or not summaries:
         return "Could not generate aggregate summary. Analysis may be incomplete."
         
     prompt = (
@@ -218,30 +81,88 @@ def summarize_reports(summaries: list[str], url: str) -> str:
     )
     
     try:
-        response = client.chat.completions.create(
-            model=LLM_MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.choices[0].message.content or "Summary generation failed."
+        return await complete(prompt, purpose="summary") or "Summary generation failed."
     except Exception as e:
         print(f"Error summarizing reports: {e}")
         return "Failed to generate an aggregate summary."
 
 
-def build_aeo_prompt(content: dict) -> str:
+# Bump when report generation changes so stored reports are rebuilt
+REPORT_VERSION = f"1:{SCORING_PROMPT_VERSION}"
+# Stored reports may be kept by the browser but must be revalidated (ETag)
+REPORT_CACHE_CONTROL = "private, no-cache"
+# Stored fallback reports (LLM unavailable) are rebuilt after this many seconds
+REPORT_FALLBACK_TTL = env_float("REPORT_FALLBACK_TTL", 60)
+# Seconds clients should wait before polling a running report job again
+REPORT_POLL_INTERVAL = 2
+
+# One LLM call writes the whole report from per-page results; the
+# two-stage summarize + format path remains the fallback
+REPORT_SINGLE_CALL = env_flag("REPORT_SINGLE_CALL", True)
+
+REPORT_SCHEMA = (
+    "SCHEMA:\n{\n  \"meta\": {\n    \"scope\": \"string\", \n    \"analyzed_at\": \"ISO 8601\", \n    \"overall_score\": \"0-100\", \n    \"analyst\": \"string\"\n  },\n  \"executive_summary\": {\n    \"summary_paragraph\": \"string\", \n    \"highlights\": [\"string\"]\n  },\n  \"overall_findings\": {\n    \"content_quality\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"structure\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"authority_signals\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"ai_agent_compatibility\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"impact\": \"string\", \n    \"common_themes\": [\"string\"]\n  },\n  \"strengths\": {\n    \"brand_domain_trust\": [\"string\"], \n    \"navigation_layout\": [\"string\"], \n    \"technical_signals\": [\"string\"]\n  },\n  \"weaknesses\": {\n    \"content_depth\": [\"string\"], \n    \"authority_trust\": [\"string\"], \n    \"semantic_accessibility\": [\"string\"], \n    \"ux_friction\": [\"string\"]\n  },\n  \"recommendations\": [{ \n    \"priority\": \"high|medium|long\", \n    \"action\": \"string\", \n    \"rationale\": \"string\", \n    \"owner\": \"content|engineering|seo|design|product|analytics\", \n    \"effort\": \"S|M|L\", \n    \"impact\": \"S|M|L\", \n    \"success_metrics\": [\"string\"] \n  }],\n  \"bottom_line\": \"string\"\n}\n\n"
+)
+
+REPORT_RULES = "RULES: Fill all fields concisely; infer briefly or []. Numbers must be in range. JSON only.\n"
+
+
+def build_single_call_report_prompt(url: str, raw_report: str) -> str:
+    """Prompt producing the full AEOReport JSON straight from per-page results."""
+    return (
+        "You are an AEO (Answer Engine Optimization) analyst. "
+        f"You have analyzed several pages from the website {url}. "
+        "Write the site report for INPUT_REPORT as STRICT JSON matching SCHEMA. Return JSON ONLY.\n"
+        "executive_summary.summary_paragraph: a single, cohesive summary of the entire site's AEO performance "
+        "(common themes, strengths, and weaknesses). bottom_line: the overall verdict in 1-2 sentences.\n\n"
+        f"INPUT_REPORT:\n{raw_report}\n\n"
+        + REPORT_SCHEMA + REPORT_RULES
+    )
+
+
+SCORES_SHAPE = (
+    "{\n  \"scores\": {\n    \"content_quality\": { \"score\": 1-5, \"reason\": string },\n    \"structure_optimization\": { \"score\": 1-5, \"reason\": string },\n    \"authority_trust\": { \"score\": 1-5, \"reason\": string },\n    \"ai_agent_compatibility\": { \"score\": 1-5, \"reason\": string }\n  }\n}\n"
+)
+
+SCORING_RULES = (
+    "Rules: "
+    "- Use integers 1-5 only for scores."
+    "- Keep reasons under 140 characters each."
+    "- Return only JSON without backticks or extra text."
+    "\nPage lines: H = heading, P = paragraph, L = list item, Meta = name=value. "
+    "Navigation/footer text shared across pages is omitted."
+)
+
+
+def format_page_content(content: dict, boilerplate: FrozenSet[str] = frozenset()) -> str:
+    """Compact, token-budgeted page block for scoring prompts (see compact_page_text)."""
+    return compact_page_text(content, boilerplate)
+
+
+def build_aeo_prompt(block: str) -> str:
+    """Scoring prompt for one page block (see format_page_content)."""
     return (
         "You are an AEO (Answer Engine Optimization) auditor. "
         "Given the following webpage content, return a strict JSON object with this shape: "
-        "{\n  \"scores\": {\n    \"content_quality\": { \"score\": 1-5, \"reason\": string },\n    \"structure_optimization\": { \"score\": 1-5, \"reason\": string },\n    \"authority_trust\": { \"score\": 1-5, \"reason\": string },\n    \"ai_agent_compatibility\": { \"score\": 1-5, \"reason\": string }\n  }\n}\n"
-        "Rules: "
-        "- Use integers 1-5 only for scores."
-        "- Keep reasons under 140 characters each."
-        "- Return only JSON without backticks or extra text."
-        f"\n\nTitle: {content.get('title','')}\n"
-        f"Headings: {content.get('headings', [])}\n"
-        f"Paragraphs: {content.get('paragraphs', [])}\n"
-        f"Lists: {content.get('lists', [])}\n"
-        f"Meta: {content.get('meta', {})}\n"
+        + SCORES_SHAPE
+        + SCORING_RULES
+        + "\n\n"
+        + block
+    )
+
+
+def build_batch_aeo_prompt(blocks: List[str]) -> str:
+    """One scoring prompt for several page blocks; the reply is a JSON array in page order."""
+    pages = "\n".join(f"### Page {i}\n{block}" for i, block in enumerate(blocks, start=1))
+    return (
+        "You are an AEO (Answer Engine Optimization) auditor. "
+        f"Given the content of the {len(blocks)} webpages below, return a strict JSON object "
+        f"{{\"results\": [...]}} whose array holds exactly {len(blocks)} objects, one per page "
+        "in the order given. Each object has a \"page\" field (the page number) and this shape: "
+        + SCORES_SHAPE
+        + SCORING_RULES
+        + "\n\n"
+        + pages
     )
 
 
@@ -259,24 +180,201 @@ def parse_llm_json(text: str) -> Dict[str, Any] | None:
     return None
 
 
-def analyze_content_with_llm(content: dict) -> Tuple[Dict[str, Any] | None, str]:
+def decode_llm_json(raw: str) -> Tuple[Any, str | None]:
+    """Decode a JSON reply: strict under structured output, regex recovery otherwise."""
+    if structured_output_enabled():
+        return load_json(raw)
+    data = parse_llm_json(raw) if raw else None
+    return data, None if data is not None else "no JSON object found"
+
+
+def valid_scores(llm_json: Any) -> bool:
+    """True when llm_json carries a 1-5 integer score and a reason for every category."""
+    if not isinstance(llm_json, dict) or not isinstance(llm_json.get("scores"), dict):
+        return False
+    for key in SCORE_CATEGORIES:
+        entry = llm_json["scores"].get(key)
+        if not isinstance(entry, dict):
+            return False
+        score = entry.get("score")
+        if not isinstance(score, int) or isinstance(score, bool) or not 1 <= score <= 5:
+            return False
+        if not isinstance(entry.get("reason"), str):
+            return False
+    return True
+
+
+def parse_page_scores(raw: str) -> Tuple[Dict[str, Any] | None, str | None]:
+    """Parse a single-page scoring reply: (llm_json, error)."""
+    data, error = decode_llm_json(raw)
+    if error is None and not valid_scores(data):
+        error = (
+            "\"scores\" must hold content_quality, structure_optimization, authority_trust and "
+            "ai_agent_compatibility, each with an integer score 1-5 and a string reason"
+        )
+    return (data if isinstance(data, dict) else None), error
+
+
+def parse_batch_scores(text: str, count: int) -> List[Dict[str, Any] | None] | None:
+    """Parse a batched scoring reply into `count` per-page results (None when unusable)."""
+    data, _ = decode_llm_json(text)
+    # The array normally arrives wrapped as {"results": [...]}
+    if isinstance(data, dict) and len(data) == 1:
+        data = next(iter(data.values()))
+    if not isinstance(data, list) or len(data) != count:
+        return None
+
+    # Honour explicit page numbers when they are a permutation of 1..count
+    pages = [item.get("page") if isinstance(item, dict) else None for item in data]
+    if sorted(p for p in pages if isinstance(p, int)) == list(range(1, count + 1)):
+        data = sorted(data, key=lambda item: item["page"])
+
+    return [{"scores": item["scores"]} if valid_scores(item) else None for item in data]
+
+
+async def analyze_content_with_llm(block: str, model: str = LLM_MODEL_NAME) -> Tuple[Dict[str, Any] | None, str]:
     """Analyze content using LLM for AEO scoring. Returns (parsed_json, raw_text)."""
-    if not client:
+    if not get_llm_client():
         return None, "LLM analysis unavailable - API client not configured"
     try:
-        prompt = build_aeo_prompt(content)
-        response = client.chat.completions.create(
-            model=LLM_MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}]
+        parsed, _, raw = await complete_json(
+            build_aeo_prompt(block), PageScoreResult, parse_page_scores, model=model, purpose="score"
         )
-        raw = response.choices[0].message.content or ""
-        parsed = parse_llm_json(raw) if raw else None
         return parsed, raw
     except Exception as e:
         print(f"Error analyzing content with LLM: {e}")
         return None, ""
 
 
+async def analyze_batch_with_llm(blocks: List[str], model: str = LLM_MODEL_NAME) -> List[Tuple[Dict[str, Any] | None, str]]:
+    """Score several pages in one request, falling back to per-page calls."""
+    if len(blocks) == 1 or not get_llm_client():
+        return list(await asyncio.gather(*(analyze_content_with_llm(block, model) for block in blocks)))
+
+    def parse(text: str) -> Tuple[List[Dict[str, Any] | None] | None, str | None]:
+        items = parse_batch_scores(text, len(blocks))
+        if items is None:
+            return None, f"expected {{\"results\": [...]}} holding exactly {len(blocks)} page objects"
+        return items, None
+
+    raw = ""
+    try:
+        parsed, _, raw = await complete_json(
+            build_batch_aeo_prompt(blocks), BatchScoreResult, parse, model=model, purpose="score_batch"
+        )
+    except Exception as e:
+        print(f"Error analyzing content batch with LLM: {e}")
+        parsed = None
+
+    if parsed is None:
+        print(f"Batched scoring of {len(blocks)} pages failed validation; scoring pages individually")
+        parsed = [None] * len(blocks)
+    results: List[Tuple[Dict[str, Any] | None, str]] = [
+        (item, json.dumps(item)) if item is not None else (None, raw) for item in parsed
+    ]
+    retry = [i for i, item in enumerate(parsed) if item is None]
+    if retry:
+        retried = await asyncio.gather(*(analyze_content_with_llm(blocks[i], model) for i in retry))
+        for i, result in zip(retry, retried):
+            results[i] = result
+    return results
+
+
+def scoring_cache_key(content: dict, model: str = LLM_MODEL_NAME) -> str:
+    return content_key({f: content.get(f) for f in PROMPT_FIELDS}, SCORING_PROMPT_VERSION, model)
+
+
+async def analyze_pages_with_llm(
+    pages: List[dict],
+    batch_size: int = 1,
+    duplicate_of: List[int | None] | None = None,
+) -> List[Tuple[Dict[str, Any] | None, str]]:
+    """Score pages concurrently, reusing near-duplicate and cached results; results follow page order."""
+    results: List[Tuple[Dict[str, Any] | None, str]] = [(None, "")] * len(pages)
+    models: List[str] = [""] * len(pages)
+    keys: List[str] = [""] * len(pages)
+    pending: List[int] = []
+    if duplicate_of is None:
+        duplicate_of = find_near_duplicates(pages)
+    dedup_stats.record(duplicate_of)
+    for i, content in enumerate(pages):
+        if duplicate_of[i] is not None:
+            continue
+        route, reason = route_page(content, score_aeo_features(content))
+        routing_stats.record(route, reason)
+        if route == ROUTE_SKIP:
+            print(f"LLM route {content.get('url')}: skip ({reason})")
+            results[i] = (heuristic_scores(content), f"routed to heuristics: {reason}")
+            continue
+        models[i] = model_for_route(route)
+        print(f"LLM route {content.get('url')}: {route} -> {models[i]} ({reason})")
+        if llm_cache:
+            keys[i] = scoring_cache_key(content, models[i])
+            cached = llm_cache.get(keys[i])
+            if cached is not None:
+                results[i] = (cached, json.dumps(cached))
+                continue
+        pending.append(i)
+
+    # Nav/footer text repeated across the site is left out of every prompt
+    boilerplate = find_boilerplate(pages)
+    groups: Dict[str, List[int]] = {}
+    for i in pending:
+        groups.setdefault(models[i], []).append(i)
+
+    calls = []
+    order: List[List[int]] = []
+    blocks: Dict[int, str] = {}
+    if llm_available():
+        # Each page is compacted (and counted in compaction_stats) once, however it is sent
+        for i in pending:
+            blocks[i] = format_page_content(pages[i], boilerplate)
+            compaction_stats.record(uncompacted_text(pages[i]), blocks[i])
+        for model, indices in groups.items():
+            if batch_size <= 1:
+                chunks = [[i] for i in indices]
+            else:
+                chunks = [indices[j:j + batch_size] for j in range(0, len(indices), batch_size)]
+            for chunk in chunks:
+                order.append(chunk)
+                calls.append(analyze_batch_with_llm([blocks[i] for i in chunk], model))
+    scored: Dict[int, Tuple[Dict[str, Any] | None, str]] = {}
+    for chunk, chunk_results in zip(order, await asyncio.gather(*calls)):
+        scored.update(zip(chunk, chunk_results))
+
+    for i in pending:
+        result = scored.get(i, (None, "LLM unavailable"))
+        if result[0] is None:
+            results[i] = (heuristic_scores(pages[i]), result[1])
+            continue
+        results[i] = result
+        if llm_cache and valid_scores(result[0]):
+            llm_cache.put(keys[i], result[0])
+
+    for i, representative in enumerate(duplicate_of):
+        if representative is not None:
+            print(f"LLM reuse {pages[i].get('url')}: near-duplicate of {pages[representative].get('url')}")
+            results[i] = (results[representative][0], f"near-duplicate of {pages[representative].get('url')}")
+    return results
+
+
+def degraded_results(
+    results: List[Tuple[Dict[str, Any] | None, str]],
+    duplicate_of: List[int | None],
+) -> List[bool]:
+    """Per page: True when an LLM score was replaced by a heuristic stand-in."""
+    degraded = []
+    for llm_json, reason in results:
+        if isinstance(llm_json, dict) and llm_json.get("source") == "heuristic":
+            degraded.append(not reason.startswith("routed to heuristics"))
+        else:
+            degraded.append(not valid_scores(llm_json))
+    for i, representative in enumerate(duplicate_of):
+        if representative is not None:
+            degraded[i] = degraded[representative]
+    return degraded
+
+
 def score_aeo_features(content: dict) -> dict:
     """Heuristic structural AEO features."""
     scores = {
@@ -352,6 +450,24 @@ def score_aeo_features(content: dict) -> dict:
     return scores
 
 
+def heuristic_scores(content: dict) -> Dict[str, Any]:
+    """Category scores from score_aeo_features alone, for when the LLM is unavailable."""
+    f = score_aeo_features(content)
+    paragraphs = content.get("paragraphs") or []
+    values = {
+        "content_quality": 1 + f["qa_text"] + f["faq_formatting"] + min(2, len(paragraphs) // 3),
+        "structure_optimization": 1 + f["semantic_markup"] + f["faq_formatting"] + f["jsonld_schema"],
+        "authority_trust": 1 + 2 * f["author_metadata"] + f["structured_data"] + f["supporting_pages_linked"],
+        "ai_agent_compatibility": 1 + 2 * f["jsonld_schema"] + f["structured_data"] + (f["meta_quality"] == 2),
+    }
+    found = [name.replace("_", " ") for name, v in f.items() if v and name != "total_score"]
+    reason = ("Heuristic estimate; signals: " + ", ".join(found) if found else "Heuristic estimate; few AEO signals found")
+    return {
+        "scores": {key: {"score": max(1, min(5, int(v))), "reason": reason[:140]} for key, v in values.items()},
+        "source": "heuristic",
+    }
+
+
 def calculate_score_from_signals(
     llm_json: Dict[str, Any] | None,
     structural_score: int,
@@ -403,44 +519,51 @@ def create_summary_from_analysis(url: str, llm_json: Dict[str, Any] | None, stru
         return f"AI-optimization analysis completed for {url}."
 
 
-async def perform_full_site_analysis(analysis_id: str, start_url: str):
-    try:
+def page_result(content: dict, llm_json: Dict[str, Any] | None, degraded: bool) -> dict:
+    """Per-page result as stored in page artifacts."""
+    structural_scores = score_aeo_features(content)
+    return {
+        "url": content["url"],
+        "score": calculate_score_from_signals(llm_json, structural_scores.get("total_score", 0)),
+        "summary": create_summary_from_analysis(content["url"], llm_json, structural_scores),
+        "llm": llm_json,
+        "structural_scores": structural_scores,
+        "content": content,
+        # Heuristic stand-in for a failed LLM call; not worth caching or reusing
+        "degraded": degraded,
+    }
+
+
+async def score_site_pages(
+    url: str,
+    batch_size: int = 1,
+    analysis_id: str | None = None,
+) -> Tuple[List[dict], List[int | None]]:
+    """Crawl and score up to 5 pages of a site: (page_results, duplicate_of)."""
+    if analysis_id:
         DatabaseService.update_analysis(analysis_id, {"status": "crawling"})
-        urls = crawl_website(start_url, max_pages=5)
-        
-        DatabaseService.update_analysis(analysis_id, {"status": "analyzing", "urls_found": len(urls)})
-        page_results = []
-        for url in urls:
-            content = extract_structured_content(url)
-            if not content: continue
-            
-            llm_json, _ = analyze_content_with_llm(content)
-            structural_scores = score_aeo_features(content)
-            score = calculate_score_from_signals(llm_json, structural_scores["total_score"])
-            summary = create_summary_from_analysis(url, llm_json, structural_scores)
-            
-            page_results.append({"url": url, "score": score, "summary": summary})
-
-        if not page_results:
-            DatabaseService.update_analysis(analysis_id, {"status": "failed", "summary": "Could not analyze any pages."})
-            return
-
-        DatabaseService.update_analysis(analysis_id, {"status": "summarizing"})
-        average_score = round(sum(r["score"] for r in page_results) / len(page_results))
-        individual_summaries = [r["summary"] for r in page_results]
-        final_summary = summarize_reports(individual_summaries, start_url)
-        
-        final_result = {
-            "status": "completed",
-            "score": average_score,
-            "summary": final_summary,
-            "page_results": page_results
-        }
-        DatabaseService.update_analysis(analysis_id, final_result)
-        print(f"Completed full site analysis for {analysis_id}")
-    except Exception as e:
-        print(f"Full site analysis failed for {analysis_id}: {e}")
-        DatabaseService.update_analysis(analysis_id, {"status": "failed", "summary": str(e)})
+    # Crawl a small set of pages concurrently to keep it fast
+    pages = await crawl_website(url, max_pages=5)
+
+    pages = [content for content in pages if content and content.get("title")]
+    if analysis_id:
+        DatabaseService.update_analysis(analysis_id, {"status": "analyzing", "urls_found": len(pages)})
+    duplicate_of = find_near_duplicates(pages)
+    llm_results = await analyze_pages_with_llm(pages, batch_size, duplicate_of)
+    degraded = degraded_results(llm_results, duplicate_of)
+
+    page_results = [
+        page_result(content, llm_json, is_degraded)
+        for content, (llm_json, _), is_degraded in zip(pages, llm_results, degraded)
+    ]
+
+    if not page_results:
+        raise HTTPException(status_code=400, detail="Unable to access or parse the URL content")
+    return page_results, duplicate_of
+
+
+# In-flight quick analyses keyed by normalized URL
+quick_flights = SingleFlight()
 
 
 @router.post("/analyze/quick", response_model=QuickAnalyzeResponse)
@@ -460,31 +583,32 @@ async def quick_analyze(req: QuickAnalyzeRequest):
         if not req.url:
             raise HTTPException(status_code=400, detail="URL cannot be empty")
 
-        # Crawl a small set of pages synchronously to keep it fast
-        urls = crawl_website(req.url, max_pages=5)
-        if not urls:
-            urls = [req.url]
-
-        page_results: List[dict] = []
-        for page_url in urls:
-            content = extract_structured_content(page_url)
-            if not content or not content.get("title"):
-                continue
-
-            llm_json, _ = analyze_content_with_llm(content)
-            structural_scores = score_aeo_features(content)
-            score = calculate_score_from_signals(llm_json, structural_scores.get("total_score", 0))
-            summary = create_summary_from_analysis(page_url, llm_json, structural_scores)
-            page_results.append({"url": page_url, "score": score, "summary": summary, "llm": llm_json})
-
-        if not page_results:
-            raise HTTPException(status_code=400, detail="Unable to access or parse the URL content")
+        # Recent results for the same URL and scoring version are reused as-is
+        cache_key = f"{SCORING_PROMPT_VERSION}:{req.url}"
+        if quick_cache and req.bypass_cache:
+            quick_cache.stats_counters["bypassed"] += 1
+        cached = quick_cache.get(cache_key) if quick_cache and not req.bypass_cache else None
+        if cached is not None:
+            DatabaseService.create_analysis(analysis_id, req.url, "", cached["response"]["overall_score"])
+            DatabaseService.update_analysis(analysis_id, {
+                "dedup": cached["dedup"],
+                "page_artifacts": cached["page_artifacts"],
+                "cached_from": cached["analysis_id"],
+            })
+            print(f"Quick analysis {analysis_id}: served from cache of {cached['analysis_id']}")
+            return QuickAnalyzeResponse(**{**cached["response"], "analysis_id": analysis_id})
+
+        # Concurrent requests for the same URL share one crawl and scoring run
+        url = req.url
+        shared_results, duplicate_of = await quick_flights.run(url, lambda: score_site_pages(url))
+        page_results = [dict(r) for r in shared_results]
 
         # Aggregate
         average_score = round(sum(r["score"] for r in page_results) / len(page_results))
 
         # Select homepage LLM scores (fallback to first)
-        primary = next((r for r in page_results if r["url"] == urls[0]), page_results[0])
+        start_url = canonicalize_url(req.url)
+        primary = next((r for r in page_results if canonicalize_url(r["url"]) == start_url), page_results[0])
         llm_scores = (primary.get("llm") or {}).get("scores") or {}
 
         # Build structured response
@@ -496,9 +620,15 @@ async def quick_analyze(req: QuickAnalyzeRequest):
             s = max(1, min(5, s))
             return CategoryScore(score=s, reason=reason)
 
+        # Lets get_report skip crawling and scoring again
+        page_artifacts = {"created_at": datetime.now(), "pages": page_results}
         DatabaseService.create_analysis(analysis_id, req.url, "", average_score)
+        DatabaseService.update_analysis(analysis_id, {
+            "dedup": dedup_summary(duplicate_of),
+            "page_artifacts": page_artifacts,
+        })
 
-        return QuickAnalyzeResponse(
+        response = QuickAnalyzeResponse(
             analysis_id=analysis_id,
             overall_score=average_score,
             url=req.url,
@@ -507,6 +637,16 @@ async def quick_analyze(req: QuickAnalyzeRequest):
             authority_trust=to_category("authority_trust"),
             ai_agent_compatibility=to_category("ai_agent_compatibility"),
         )
+        if quick_cache and any(r["degraded"] for r in page_results):
+            print(f"Quick analysis {analysis_id}: not cached (heuristic fallback scores)")
+        elif quick_cache:
+            quick_cache.put(cache_key, {
+                "analysis_id": analysis_id,
+                "response": response.model_dump(),
+                "dedup": dedup_summary(duplicate_of),
+                "page_artifacts": page_artifacts,
+            })
+        return response
 
     except HTTPException as he:
         raise he
@@ -544,58 +684,71 @@ async def request_report(req: ReportRequest):
 
 
 
-@router.get("/report/{analysis_id}", response_model=AEOReport)
-async def get_report(analysis_id: str):
-    """Run full-site analysis for the given analysis_id and return a detailed report."""
-    data = DatabaseService.get_analysis(analysis_id)
-    if not data:
-        raise HTTPException(status_code=404, detail="Report not found")
-    
-    # Perform full-site analysis synchronously for now
+def stored_page_results(data: dict) -> List[dict] | None:
+    """Per-page results saved by quick_analyze, or None when missing or stale."""
+    artifacts = data.get("page_artifacts") or {}
+    pages = artifacts.get("pages")
+    created_at = artifacts.get("created_at")
+    if not pages or created_at is None:
+        return None
+    if datetime.now() - created_at > timedelta(seconds=PAGE_ARTIFACT_TTL):
+        return None
+    return pages
+
+
+async def rescore_degraded(analysis_id: str, data: dict, page_results: List[dict]) -> List[dict]:
+    """Score stored pages again whose LLM scoring fell back to heuristics."""
+    retry = [i for i, r in enumerate(page_results) if r.get("degraded") and r.get("content")]
+    if not retry:
+        return page_results
+    print(f"Report {analysis_id}: re-scoring {len(retry)} pages with heuristic fallback scores")
+    contents = [page_results[i]["content"] for i in retry]
+    duplicate_of = find_near_duplicates(contents)
+    llm_results = await analyze_pages_with_llm(contents, LLM_SCORING_BATCH_SIZE, duplicate_of)
+    degraded = degraded_results(llm_results, duplicate_of)
+    page_results = list(page_results)
+    for i, content, (llm_json, _), is_degraded in zip(retry, contents, llm_results, degraded):
+        page_results[i] = page_result(content, llm_json, is_degraded)
+    DatabaseService.update_analysis(analysis_id, {
+        "page_artifacts": {**data["page_artifacts"], "pages": page_results},
+    })
+    return page_results
+
+
+async def build_report(analysis_id: str, data: dict) -> Tuple[dict, bool]:
+    """Generate the report for an analysis: (report, complete)."""
     url = data.get("url")
     if not url:
         raise HTTPException(status_code=400, detail="Analysis URL missing")
 
-    urls = crawl_website(url, max_pages=5)
-    if not urls:
-        urls = [url]
-
-    page_results: List[dict] = []
-    for page_url in urls:
-        content = extract_structured_content(page_url)
-        if not content:
-            continue
-        llm_json, _ = analyze_content_with_llm(content)
-        structural_scores = score_aeo_features(content)
-        score = calculate_score_from_signals(llm_json, structural_scores.get("total_score", 0))
-        summary = create_summary_from_analysis(page_url, llm_json, structural_scores)
-        page_results.append({"url": page_url, "score": score, "summary": summary})
+    page_results = stored_page_results(data)
+    if page_results is not None:
+        print(f"Report {analysis_id}: reusing {len(page_results)} page results from quick analysis")
+        page_results = await rescore_degraded(analysis_id, data, page_results)
+    else:
+        page_results, duplicate_of = await score_site_pages(url, LLM_SCORING_BATCH_SIZE, analysis_id)
+        DatabaseService.update_analysis(analysis_id, {"dedup": dedup_summary(duplicate_of)})
 
     if not page_results:
         raise HTTPException(status_code=400, detail="Unable to generate report from the site content")
 
+    DatabaseService.update_analysis(analysis_id, {"status": "summarizing", "pages_analyzed": len(page_results)})
+    scored = not any(r.get("degraded") for r in page_results)
     average_score = round(sum(r["score"] for r in page_results) / len(page_results))
-    final_summary = summarize_reports([r["summary"] for r in page_results], url)
-
-    # Build RAW_REPORT string
-    raw_lines = [
-        f"Overall Score: {average_score}",
-        f"URL: {url}",
-        "\nPage Results:",
-    ]
-    for r in page_results:
-        raw_lines.append(f"- {r['url']} — {r['score']}/100\n  {r['summary']}")
-    raw_lines.append("\nAggregate Summary:\n" + final_summary)
-    raw_report = "\n".join(raw_lines)
 
-    # Format with LLM per slim schema (fewer tokens)
-    prompt = (
-        "Format INPUT_REPORT into STRICT JSON matching SCHEMA. Return JSON ONLY.\n\n"
-        "INPUT_REPORT:\n{{RAW_REPORT}}\n\n"
-        "SCHEMA:\n{\n  \"meta\": {\n    \"scope\": \"string\", \n    \"analyzed_at\": \"ISO 8601\", \n    \"overall_score\": \"0-100\", \n    \"analyst\": \"string\"\n  },\n  \"executive_summary\": {\n    \"summary_paragraph\": \"string\", \n    \"highlights\": [\"string\"]\n  },\n  \"overall_findings\": {\n    \"content_quality\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"structure\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"authority_signals\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"ai_agent_compatibility\": { \"score\": 1-5, \"notes\": \"string\" }, \n    \"impact\": \"string\", \n    \"common_themes\": [\"string\"]\n  },\n  \"strengths\": {\n    \"brand_domain_trust\": [\"string\"], \n    \"navigation_layout\": [\"string\"], \n    \"technical_signals\": [\"string\"]\n  },\n  \"weaknesses\": {\n    \"content_depth\": [\"string\"], \n    \"authority_trust\": [\"string\"], \n    \"semantic_accessibility\": [\"string\"], \n    \"ux_friction\": [\"string\"]\n  },\n  \"recommendations\": [{ \n    \"priority\": \"high|medium|long\", \n    \"action\": \"string\", \n    \"rationale\": \"string\", \n    \"owner\": \"content|engineering|seo|design|product|analytics\", \n    \"effort\": \"S|M|L\", \n    \"impact\": \"S|M|L\", \n    \"success_metrics\": [\"string\"] \n  }],\n  \"bottom_line\": \"string\"\n}\n\nRULES: Fill all fields concisely; infer briefly or []. Numbers must be in range. JSON only.\n"
-    ).replace("{{RAW_REPORT}}", raw_report)
+    def report_input(final_summary: str | None) -> str:
+        raw_lines = [
+            f"Overall Score: {average_score}",
+            f"URL: {url}",
+            "\nPage Results:",
+        ]
+        for r in page_results:
+            raw_lines.append(f"- {r['url']} — {r['score']}/100\n  {r['summary']}")
+        if final_summary is not None:
+            raw_lines.append("\nAggregate Summary:\n" + final_summary)
+        return "\n".join(raw_lines)
 
-    def build_fallback() -> dict:
+    def build_fallback(final_summary: str) -> dict:
         today_iso = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
         return {
             "meta": {
@@ -614,6 +767,7 @@ async def get_report(analysis_id: str):
                 "content_quality": {"score": 3, "notes": ""},
                 "structure": {"score": 3, "notes": ""},
                 "authority_signals": {"score": 3, "notes": ""},
+                "ai_agent_compatibility": {"score": 3, "notes": ""},
                 "impact": "",
                 "common_themes": []
             },
@@ -623,132 +777,290 @@ async def get_report(analysis_id: str):
             "bottom_line": final_summary
         }
 
-    if not client:
-        return build_fallback()
+    async def generate_report(prompt: str, final_summary: str | None) -> dict | None:
+        """One report LLM call merged over defaults; None when no valid report came back."""
+        try:
+            # Build defaults to avoid empty fields
+            try:
+                domain = urlparse(url).netloc
+            except Exception:
+                domain = url
+            today_iso = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+            defaults = {
+                "meta": {
+                    "report_title": "AI-optimization Site Report",
+                    "scope": url,
+                    "analyzed_at": today_iso,
+                    "overall_score": average_score,
+                    "analyst": "AI",
+                    "tool_version": "1.0",
+                },
+                "executive_summary": {
+                    "summary_paragraph": final_summary or "",
+                    "highlights": [
+                        f"Average score: {average_score}/100",
+                        f"Pages analyzed: {len(page_results)}",
+                        f"Domain: {domain}",
+                    ],
+                },
+                "overall_findings": {
+                    "content_quality": {"score": 3, "notes": "Content depth varies across pages"},
+                    "structure": {"score": 3, "notes": "Heading and section usage is inconsistent"},
+                    "authority_signals": {"score": 3, "notes": "Explicit authorship/dates often missing"},
+                    "ai_agent_compatibility": {"score": 3, "notes": "Limited structured cues for agent parsing and actions"},
+                    "impact": "Addressing metadata, structure, and trust signals should improve discoverability and trust",
+                    "common_themes": [
+                        "Inconsistent content depth",
+                        "Missing meta descriptions/titles on some pages",
+                        "Variable heading structure",
+                    ],
+                },
+                "strengths": {
+                    "brand_domain_trust": [f"Recognizable domain: {domain}"],
+                    "navigation_layout": [],
+                    "technical_signals": [],
+                },
+                "weaknesses": {
+                    "content_depth": ["Some pages are thin or purely functional"],
+                    "authority_trust": ["Lack of explicit authorship or dates"],
+                    "semantic_accessibility": ["Headings and landmarks not consistently used"],
+                    "ux_friction": ["Limited guidance on utility/policy pages"],
+                },
+                "recommendations": [
+                    {
+                        "priority": "high",
+                        "action": "Add descriptive meta titles/descriptions and unique H1s",
+                        "rationale": "Improves clarity, CTR, and scannability",
+                        "owner": "seo",
+                        "effort": "S",
+                        "impact": "M",
+                        "success_metrics": ["% pages with meta description", "% pages with unique H1"],
+                    }
+                ],
+                "bottom_line": final_summary or "",
+            }
+
+            def deep_merge(base: dict, overlay: dict) -> dict:
+                out = dict(base)
+                for k, v in (overlay or {}).items():
+                    if isinstance(v, dict) and isinstance(out.get(k), dict):
+                        out[k] = deep_merge(out[k], v)
+                    else:
+                        out[k] = v
+                return out
+
+            def parse_report(raw: str) -> Tuple[Dict[str, Any] | None, str | None]:
+                data, error = decode_llm_json(raw)
+                if error is not None:
+                    return None, error
+                if not isinstance(data, dict):
+                    return None, "expected a JSON object"
+                if final_summary is None and not (
+                    (data.get("executive_summary") or {}).get("summary_paragraph") and data.get("bottom_line")
+                ):
+                    return None, "executive_summary.summary_paragraph and bottom_line are required"
+                try:
+                    AEOReport(**deep_merge(defaults, data))
+                except ValidationError as e:
+                    return data, str(e)
+                return data, None
+
+            purpose = "report" if final_summary is not None else "report_single"
+            data, error, _ = await complete_json(prompt, AEOReport, parse_report, purpose=purpose)
+            if data is None:
+                print(f"Report generation [{purpose}] returned no usable JSON ({error})")
+                return None
+
+            merged = deep_merge(defaults, data)
+
+            # Coalesce empties: fill empty strings/arrays with defaults where applicable
+            es = merged.get("executive_summary", {})
+            if not es.get("summary_paragraph"):
+                es["summary_paragraph"] = defaults["executive_summary"]["summary_paragraph"]
+            if not es.get("highlights"):
+                es["highlights"] = defaults["executive_summary"]["highlights"]
+            of = merged.get("overall_findings", {})
+            for key in ("content_quality", "structure", "authority_signals", "ai_agent_compatibility"):
+                sec = of.get(key, {})
+                if not sec.get("notes"):
+                    sec["notes"] = defaults["overall_findings"][key]["notes"]
+                if not isinstance(sec.get("score"), int):
+                    sec["score"] = 3
+                of[key] = sec
+            if not of.get("impact"):
+                of["impact"] = defaults["overall_findings"]["impact"]
+            if not of.get("common_themes"):
+                of["common_themes"] = defaults["overall_findings"]["common_themes"]
+            merged["overall_findings"] = of
+
+            for cat in ("brand_domain_trust", "navigation_layout", "technical_signals"):
+                if not merged.get("strengths", {}).get(cat):
+                    merged.setdefault("strengths", {})[cat] = [] if cat != "brand_domain_trust" else defaults["strengths"]["brand_domain_trust"]
+            for cat in ("content_depth", "authority_trust", "semantic_accessibility", "ux_friction"):
+                if not merged.get("weaknesses", {}).get(cat):
+                    merged.setdefault("weaknesses", {})[cat] = [defaults["weaknesses"][cat][0]]
+
+            if not merged.get("recommendations"):
+                merged["recommendations"] = defaults["recommendations"]
+            # Limit recommendations to at most 3 items
+            if isinstance(merged.get("recommendations"), list):
+                merged["recommendations"] = merged["recommendations"][:3]
+            if not merged.get("bottom_line"):
+                merged["bottom_line"] = defaults["bottom_line"]
+
+            # Ensure meta.tool_version exists
+            merged.setdefault("meta", {})
+            merged["meta"].setdefault("tool_version", "1.0")
+
+            # Validate against schema
+            validated = AEOReport(**merged)
+            return json.loads(validated.model_dump_json())
+        except Exception as e:
+            print(f"Report generation failed: {e}")
+            return None
 
-    try:
-        response = client.chat.completions.create(
-            model=LLM_MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        content = response.choices[0].message.content or "{}"
-        data = json.loads(content)
+    if llm_available() and REPORT_SINGLE_CALL:
+        report = await generate_report(build_single_call_report_prompt(url, report_input(None)), None)
+        if report is not None:
+            return report, scored
+        print("Single-call report generation failed; falling back to summary + formatting")
 
-        # Build defaults to avoid empty fields
+    final_summary = await summarize_reports([r["summary"] for r in page_results], url)
+    if not llm_available():
+        return build_fallback(final_summary), False
+
+    # Format with LLM per slim schema (fewer tokens)
+    prompt = (
+        "Format INPUT_REPORT into STRICT JSON matching SCHEMA. Return JSON ONLY.\n\n"
+        "INPUT_REPORT:\n{{RAW_REPORT}}\n\n"
+        + REPORT_SCHEMA + REPORT_RULES
+    ).replace("{{RAW_REPORT}}", report_input(final_summary))
+    report = await generate_report(prompt, final_summary)
+    if report is None:
+        print("Formatting failed, returning fallback schema")
+        return build_fallback(final_summary), False
+    return report, scored
+
+
+def report_etag(report: dict) -> str:
+    payload = json.dumps(report, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(f"{REPORT_VERSION}\n{payload}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110): W/"x" matches "x"
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def save_report(analysis_id: str, report: dict, complete: bool) -> dict:
+    return DatabaseService.save_report(analysis_id, {
+        "report": report,
+        "version": REPORT_VERSION,
+        "generated_at": datetime.now(timezone.utc),
+        "etag": report_etag(report),
+        "complete": complete,
+    })
+
+
+async def run_report_job(analysis_id: str) -> None:
+    """Background job: build and store the report (see report_jobs)."""
+    data = DatabaseService.get_analysis(analysis_id)
+    if not data:
+        return
+    report, complete = await build_report(analysis_id, data)
+    save_report(analysis_id, report, complete)
+    DatabaseService.update_analysis(analysis_id, {"status": "completed"})
+    print(f"Report {analysis_id} {'completed' if complete else 'completed with fallback content'}")
+
+
+report_jobs = JobQueue(run_report_job, ANALYSIS_WORKERS, ANALYSIS_QUEUE_MAX, ANALYSIS_JOB_TIMEOUT)
+
+
+def usable_report(analysis_id: str) -> dict | None:
+    """The stored report, unless it is from an older REPORT_VERSION or a fallback due for a retry."""
+    stored = DatabaseService.get_report(analysis_id)
+    if not stored or stored.get("version") != REPORT_VERSION:
+        return None
+    age = (datetime.now(timezone.utc) - stored["generated_at"]).total_seconds()
+    if not stored.get("complete") and age > REPORT_FALLBACK_TTL:
+        return None
+    return stored
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def report_status(analysis_id: str, data: dict) -> ReportStatus:
+    ready = not report_jobs.is_active(analysis_id) and usable_report(analysis_id) is not None
+    return ReportStatus(
+        site_id=analysis_id,
+        status=data.get("status") or "ready",
+        score=data.get("score") or 0,
+        report_url=f"/report/{analysis_id}" if ready else None,
+        urls_found=data.get("urls_found"),
+        pages_analyzed=data.get("pages_analyzed"),
+        queued_at=_iso(data.get("queued_at")),
+        started_at=_iso(data.get("started_at")),
+        finished_at=_iso(data.get("finished_at")),
+        error=data.get("error"),
+    )
+
+
+@router.get("/report/status/{analysis_id}", response_model=ReportStatus)
+async def get_report_status(analysis_id: str):
+    """Stage (queued, crawling, analyzing, summarizing, completed, failed) and progress of a report job."""
+    data = DatabaseService.get_analysis(analysis_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report_status(analysis_id, data)
+
+
+@router.get("/report/{analysis_id}", response_model=AEOReport)
+async def get_report(
+    analysis_id: str,
+    request: Request,
+    response: Response,
+    regenerate: bool = False,
+):
+    """Return the detailed report for the given analysis_id."""
+    data = DatabaseService.get_analysis(analysis_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    stored = None if report_jobs.is_active(analysis_id) else usable_report(analysis_id)
+    # A failed regenerate leaves the earlier stored report in place; only report the failure without one
+    if stored is None and data.get("status") == "failed" and not regenerate and not report_jobs.is_active(analysis_id):
+        raise HTTPException(status_code=data.get("error_status") or 500, detail=data.get("error") or "Report generation failed")
+    if stored is None or regenerate:
         try:
-            domain = urlparse(url).netloc
-        except Exception:
-            domain = url
-        today_iso = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-        defaults = {
-            "meta": {
-                "report_title": "AI-optimization Site Report",
-                "scope": url,
-                "analyzed_at": today_iso,
-                "overall_score": average_score,
-                "analyst": "AI",
-                "tool_version": "1.0",
-            },
-            "executive_summary": {
-                "summary_paragraph": final_summary,
-                "highlights": [
-                    f"Average score: {average_score}/100",
-                    f"Pages analyzed: {len(page_results)}",
-                    f"Domain: {domain}",
-                ],
-            },
-            "overall_findings": {
-                "content_quality": {"score": 3, "notes": "Content depth varies across pages"},
-                "structure": {"score": 3, "notes": "Heading and section usage is inconsistent"},
-                "authority_signals": {"score": 3, "notes": "Explicit authorship/dates often missing"},
-                "ai_agent_compatibility": {"score": 3, "notes": "Limited structured cues for agent parsing and actions"},
-                "impact": "Addressing metadata, structure, and trust signals should improve discoverability and trust",
-                "common_themes": [
-                    "Inconsistent content depth",
-                    "Missing meta descriptions/titles on some pages",
-                    "Variable heading structure",
-                ],
-            },
-            "strengths": {
-                "brand_domain_trust": [f"Recognizable domain: {domain}"],
-                "navigation_layout": [],
-                "technical_signals": [],
-            },
-            "weaknesses": {
-                "content_depth": ["Some pages are thin or purely functional"],
-                "authority_trust": ["Lack of explicit authorship or dates"],
-                "semantic_accessibility": ["Headings and landmarks not consistently used"],
-                "ux_friction": ["Limited guidance on utility/policy pages"],
-            },
-            "recommendations": [
-                {
-                    "priority": "high",
-                    "action": "Add descriptive meta titles/descriptions and unique H1s",
-                    "rationale": "Improves clarity, CTR, and scannability",
-                    "owner": "seo",
-                    "effort": "S",
-                    "impact": "M",
-                    "success_metrics": ["% pages with meta description", "% pages with unique H1"],
-                }
-            ],
-            "bottom_line": final_summary,
-        }
+            report_jobs.enqueue(analysis_id)
+        except QueueFullError as e:
+            print(f"Report {analysis_id} not queued: {e}")
+            raise HTTPException(status_code=503, detail="Too many reports in progress, try again shortly",
+                                headers={"Retry-After": str(REPORT_POLL_INTERVAL * 5)})
+        return JSONResponse(
+            status_code=202,
+            content=report_status(analysis_id, data).model_dump(),
+            headers={"Location": f"/report/status/{analysis_id}", "Retry-After": str(REPORT_POLL_INTERVAL)},
+        )
 
-        def deep_merge(base: dict, overlay: dict) -> dict:
-            out = dict(base)
-            for k, v in (overlay or {}).items():
-                if isinstance(v, dict) and isinstance(out.get(k), dict):
-                    out[k] = deep_merge(out[k], v)
-                else:
-                    out[k] = v
-            return out
-
-        merged = deep_merge(defaults, data if isinstance(data, dict) else {})
-
-        # Coalesce empties: fill empty strings/arrays with defaults where applicable
-        es = merged.get("executive_summary", {})
-        if not es.get("summary_paragraph"):
-            es["summary_paragraph"] = final_summary
-        if not es.get("highlights"):
-            es["highlights"] = defaults["executive_summary"]["highlights"]
-        of = merged.get("overall_findings", {})
-        for key in ("content_quality", "structure", "authority_signals", "ai_agent_compatibility"):
-            sec = of.get(key, {})
-            if not sec.get("notes"):
-                sec["notes"] = defaults["overall_findings"][key]["notes"]
-            if not isinstance(sec.get("score"), int):
-                sec["score"] = 3
-            of[key] = sec
-        if not of.get("impact"):
-            of["impact"] = defaults["overall_findings"]["impact"]
-        if not of.get("common_themes"):
-            of["common_themes"] = defaults["overall_findings"]["common_themes"]
-        merged["overall_findings"] = of
-
-        for cat in ("brand_domain_trust", "navigation_layout", "technical_signals"):
-            if not merged.get("strengths", {}).get(cat):
-                merged.setdefault("strengths", {})[cat] = [] if cat != "brand_domain_trust" else defaults["strengths"]["brand_domain_trust"]
-        for cat in ("content_depth", "authority_trust", "semantic_accessibility", "ux_friction"):
-            if not merged.get("weaknesses", {}).get(cat):
-                merged.setdefault("weaknesses", {})[cat] = [defaults["weaknesses"][cat][0]]
-
-        if not merged.get("recommendations"):
-            merged["recommendations"] = defaults["recommendations"]
-        # Limit recommendations to at most 3 items
-        if isinstance(merged.get("recommendations"), list):
-            merged["recommendations"] = merged["recommendations"][:3]
-        if not merged.get("bottom_line"):
-            merged["bottom_line"] = final_summary
-
-        # Ensure meta.tool_version exists
-        merged.setdefault("meta", {})
-        merged["meta"].setdefault("tool_version", "1.0")
-
-        # Validate against schema
-        validated = AEOReport(**merged)
-        return json.loads(validated.model_dump_json())
-    except Exception as e:
-        print(f"Formatting failed, returning fallback schema: {e}")
-        return build_fallback()
+    if not stored.get("complete"):
+        response.headers["Cache-Control"] = "no-store"
+        return stored["report"]
+    headers = {
+        "ETag": stored["etag"],
+        "Cache-Control": REPORT_CACHE_CONTROL,
+        "Last-Modified": format_datetime(stored["generated_at"], usegmt=True),
+    }
+    if etag_matches(request.headers.get("if-none-match"), stored["etag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return stored["report"]
 
 # Steps endpoint removed from workflow
@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+
+from ..fingerprint import dedup_stats
+from ..http_cache import page_cache
+from ..llm import breaker, usage_stats
+from ..llm_cache import llm_cache
+from ..parse_pool import parse_pool
+from ..prompt_budget import compaction_stats
+from ..quick_cache import quick_cache
+from ..routing import routing_stats
+from .analysis import quick_flights, report_jobs
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("")
+async def get_metrics():
+    """Cache and pipeline counters for monitoring"""
+    return {
+        "http_cache": page_cache.stats() if page_cache else {"enabled": False},
+        "parse_pool": parse_pool.stats(),
+        "llm_cache": llm_cache.stats() if llm_cache else {"enabled": False},
+        "llm_usage": usage_stats.stats(),
+        "llm_breaker": breaker.stats(),
+        "llm_routing": routing_stats.stats(),
+        "prompt_compaction": compaction_stats.stats(),
+        "near_duplicates": dedup_stats.stats(),
+        "report_jobs": report_jobs.stats(),
+        "quick_analyze_coalescing": quick_flights.stats(),
+        "quick_cache": quick_cache.stats() if quick_cache else {"enabled": False},
+    }
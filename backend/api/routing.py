@@ -0,0 +1,86 @@
+import os
+import re
+from typing import Any, Dict, Tuple
+
+from .config import env_flag, env_int
+from .llm import LLM_MODEL_NAME
+
+LLM_ROUTING_ENABLED = env_flag("LLM_ROUTING_ENABLED", True)
+# Cheaper model for thin/navigation pages; empty sends them to the main model
+LLM_LIGHT_MODEL_NAME = os.environ.get("OPENAI_LIGHT_MODEL", "").strip()
+# Pages with less visible text than this skip the LLM (heuristic scores only)
+LLM_ROUTE_SKIP_MAX_CHARS = env_int("LLM_ROUTE_SKIP_MAX_CHARS", 200)
+# Pages with less visible text than this use the light model
+LLM_ROUTE_LIGHT_MAX_CHARS = env_int("LLM_ROUTE_LIGHT_MAX_CHARS", 800)
+# Error pages only skip the LLM when they are short, so articles about errors are still scored
+ERROR_PAGE_MAX_CHARS = 1500
+NAV_MIN_ITEMS = 6
+NAV_MAX_PARAGRAPH_CHARS = 200
+
+ERROR_PAGE_PATTERN = re.compile(
+    r"^\s*(?:error\s*)?(?:400|401|403|404|410|429|500|502|503)\b"
+    r"|\b(?:page not found|not found|access denied|forbidden|page (?:is )?unavailable|something went wrong)\b",
+    re.IGNORECASE,
+)
+
+ROUTE_SKIP = "skip"
+ROUTE_LIGHT = "light"
+ROUTE_FULL = "full"
+
+
+def _chars(items: Any) -> int:
+    return sum(len(str(item)) for item in items or [])
+
+
+def route_page(content: dict, features: dict) -> Tuple[str, str]:
+    """Decide how a page is scored from its score_aeo_features: (skip | light | full, reason)."""
+    if not LLM_ROUTING_ENABLED:
+        return ROUTE_FULL, "routing disabled"
+
+    paragraph_chars = _chars(content.get("paragraphs"))
+    text_chars = paragraph_chars + _chars(content.get("headings")) + _chars(content.get("lists"))
+    headline = " ".join([content.get("title") or "", *(content.get("headings") or [])[:1]])
+
+    if text_chars < ERROR_PAGE_MAX_CHARS and ERROR_PAGE_PATTERN.search(headline):
+        return ROUTE_SKIP, "error page"
+    if text_chars < LLM_ROUTE_SKIP_MAX_CHARS:
+        return ROUTE_SKIP, f"near-empty ({text_chars} chars)"
+
+    has_qa = features.get("qa_text") or features.get("faq_formatting")
+    nav_items = max(len(content.get("lists") or []), len(content.get("links_text") or []))
+    if not has_qa and paragraph_chars < NAV_MAX_PARAGRAPH_CHARS and nav_items >= NAV_MIN_ITEMS:
+        return ROUTE_LIGHT, "navigation page"
+    if not has_qa and text_chars < LLM_ROUTE_LIGHT_MAX_CHARS:
+        return ROUTE_LIGHT, f"thin page ({text_chars} chars)"
+    return ROUTE_FULL, "content page"
+
+
+def model_for_route(route: str) -> str:
+    if route == ROUTE_LIGHT and LLM_LIGHT_MODEL_NAME:
+        return LLM_LIGHT_MODEL_NAME
+    return LLM_MODEL_NAME
+
+
+class RoutingStats:
+    """Count of routing decisions per route and reason."""
+
+    def __init__(self):
+        self.routes: Dict[str, int] = {ROUTE_SKIP: 0, ROUTE_LIGHT: 0, ROUTE_FULL: 0}
+        self.reasons: Dict[str, int] = {}
+
+    def record(self, route: str, reason: str) -> None:
+        self.routes[route] = self.routes.get(route, 0) + 1
+        # Drop per-page detail such as "(123 chars)" so reasons aggregate
+        label = reason.split(" (", 1)[0]
+        self.reasons[label] = self.reasons.get(label, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": LLM_ROUTING_ENABLED,
+            "light_model": LLM_LIGHT_MODEL_NAME or LLM_MODEL_NAME,
+            "routes": dict(self.routes),
+            "reasons": dict(self.reasons),
+        }
+
+
+routing_stats = RoutingStats()
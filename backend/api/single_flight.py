@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from .utils import ratio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one shielded execution."""
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Task] = {}
+        self.stats_counters = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Mark the exception retrieved even when every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats_counters["calls"] += 1
+        task = self._flights.get(key)
+        if task is None:
+            self.stats_counters["executions"] += 1
+            task = asyncio.create_task(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.stats_counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        counters = dict(self.stats_counters)
+        calls = counters["calls"]
+        return {
+            **counters,
+            # Share of calls served by another caller's execution
+            "coalesce_rate": ratio(counters["coalesced"], calls),
+            "in_flight": len(self._flights),
+        }
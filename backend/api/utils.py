@@ -41,4 +41,7 @@ def send_verification_email(email: str, code: str) -> bool:
     #     print(f"Failed to send email: {e}")
     #     return False
     
-    return True  # Mock success 
\ No newline at end of file
+    return True  # Mock success 
+def ratio(part: int, whole: int) -> float:
+    """part / whole rounded for /metrics, 0.0 when nothing was counted"""
+    return round(part / whole, 4) if whole else 0.0
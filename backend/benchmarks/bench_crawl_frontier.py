@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the crawl frontier on synthetic nav-heavy pages.
+
+Compares the original list-based frontier (pop(0) plus linear `in` scans)
+with api.crawler.CrawlFrontier (deque plus canonicalized seen-set).
+
+Run from the backend directory:
+    python -m benchmarks.bench_crawl_frontier
+"""
+
+import random
+import time
+from urllib.parse import urlparse
+
+from api.crawler import CrawlFrontier
+
+BASE = "https://www.example.com"
+
+
+def make_nav_page_links(n_links: int, seed: int) -> list[str]:
+    """Anchors typical of a large mega-menu: many sections plus variants."""
+    rng = random.Random(seed)
+    links = []
+    for i in range(n_links):
+        path = f"/category-{i % 400}/item-{i % 1500}"
+        variant = rng.randrange(5)
+        if variant == 0:
+            links.append(BASE + path)
+        elif variant == 1:
+            links.append(BASE + path + "/")
+        elif variant == 2:
+            links.append(BASE + path + "#section-" + str(rng.randrange(5)))
+        elif variant == 3:
+            links.append(BASE + path + "?utm_source=nav&utm_medium=menu")
+        else:
+            links.append("https://cdn.example.net" + path)
+    return links
+
+
+def legacy_frontier(pages: list[list[str]]) -> tuple[int, int]:
+    domain = urlparse(BASE).netloc
+    urls_to_visit = [BASE]
+    visited_urls = set()
+    popped = 0
+    for links in pages:
+        url = urls_to_visit.pop(0)
+        visited_urls.add(url)
+        popped += 1
+        for full_url in links:
+            if (
+                urlparse(full_url).netloc == domain and
+                full_url not in visited_urls and
+                full_url not in urls_to_visit
+            ):
+                urls_to_visit.append(full_url)
+    return popped, len(urls_to_visit)
+
+
+def new_frontier(pages: list[list[str]]) -> tuple[int, int]:
+    frontier = CrawlFrontier(BASE)
+    popped = 0
+    for links in pages:
+        frontier.pop()
+        popped += 1
+        for full_url in links:
+            frontier.add(full_url)
+    return popped, len(frontier)
+
+
+def run(n_pages: int, n_links: int) -> None:
+    pages = [make_nav_page_links(n_links, seed) for seed in range(n_pages)]
+    for name, fn in (("legacy list", legacy_frontier), ("CrawlFrontier", new_frontier)):
+        start = time.perf_counter()
+        _, queued = fn(pages)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"   {name:<14} {elapsed:9.1f} ms   queued={queued}")
+
+
+if __name__ == "__main__":
+    for n_pages, n_links in ((5, 500), (5, 2000), (5, 5000), (20, 5000)):
+        print(f"📊 {n_pages} pages x {n_links} anchors")
+        run(n_pages, n_links)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-page CPU time of parsing plus structured-content extraction.
+
+Compares the original multi-pass extractor (html.parser, six find_all
+traversals plus full get_text on every heading/p/li/a) with
+api.extraction.parse_page (single DOM walk with per-field caps) on every
+installed parser backend, and checks each produces the same content dict
+and link list as the original.
+
+Run from the backend directory with a corpus of saved HTML pages:
+    python -m benchmarks.bench_extraction path/to/pages/ [more.html ...]
+
+Without arguments a synthetic nav-heavy corpus is generated.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, List
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from api.extraction import available_backends, parse_page
+from api.fingerprint import simhash
+
+
+def legacy_extract(soup: BeautifulSoup, url: str) -> tuple[dict, list[str]]:
+    """Frozen copy of the pre-single-pass extractor and link extraction."""
+    headings = [h.get_text(strip=True) for h in soup.find_all(re.compile("^h[1-6]$"))]
+    paragraphs = [p.get_text(strip=True) for p in soup.find_all("p")]
+    lists = [li.get_text(strip=True) for li in soup.find_all("li")]
+    meta_tags = {
+        (m.get("name") or m.get("property")): m.get("content")
+        for m in soup.find_all("meta")
+        if isinstance(m, Tag) and m.get("content") and (m.get("name") or m.get("property"))
+    }
+
+    jsonld_types: List[str] = []
+    for s in soup.find_all("script", type="application/ld+json"):
+        raw_json = s.get_text(strip=True) if s else None
+        if not raw_json:
+            continue
+        try:
+            data = json.loads(raw_json)
+        except Exception:
+            continue
+
+        def collect_types(node: Any):
+            if isinstance(node, dict):
+                node_type = node.get("@type")
+                if isinstance(node_type, str):
+                    jsonld_types.append(node_type)
+                elif isinstance(node_type, list):
+                    for t in node_type:
+                        if isinstance(t, str):
+                            jsonld_types.append(t)
+                if "@graph" in node and isinstance(node["@graph"], list):
+                    for child in node["@graph"]:
+                        collect_types(child)
+            elif isinstance(node, list):
+                for item in node:
+                    collect_types(item)
+
+        collect_types(data)
+
+    links_text: List[str] = []
+    for a in soup.find_all("a", href=True):
+        txt = a.get_text(strip=True)
+        if txt:
+            links_text.append(txt.lower())
+
+    content = {
+        "url": url,
+        "title": soup.title.string[:180] if soup.title and soup.title.string else "",
+        "headings": headings[:12],
+        "paragraphs": paragraphs[:8],
+        "lists": lists[:12],
+        "meta": {k: meta_tags[k] for k in list(meta_tags.keys())[:12] if k},
+        "jsonld_types": list(dict.fromkeys(jsonld_types))[:12],
+        "links_text": links_text[:30],
+    }
+
+    links: List[str] = []
+    for link in soup.find_all("a", href=True):
+        href_val = link.get("href")
+        if not href_val or not isinstance(href_val, str):
+            continue
+        full_url = urljoin(url, href_val)
+        if urlparse(full_url).scheme in ["http", "https"]:
+            links.append(full_url)
+    return content, links
+
+
+def synthetic_corpus() -> list[tuple[str, str]]:
+    pages = []
+    for n in (200, 1000, 4000):
+        nav = "".join(
+            f'<li><a href="/section-{i}/"><span>Section {i}</span></a>'
+            f'<ul><li><a href="/section-{i}/sub">Sub {i}</a></li></ul></li>'
+            for i in range(n)
+        )
+        body = "".join(
+            f"<h2>Heading {i}</h2><p>Paragraph {i} with <b>bold</b> text and "
+            f'<a href="?utm_source=x&p={i}">inline link</a>.</p>'
+            for i in range(n // 2)
+        )
+        html = (
+            "<html><head><title>Synthetic nav-heavy page</title>"
+            '<meta name="description" content="Synthetic page used for extraction benchmarks">'
+            '<meta property="og:title" content="Synthetic"></head><body>'
+            f"<nav><ul>{nav}</ul></nav><main>{body}</main>"
+            '<script type="application/ld+json">{"@type": "Article"}</script>'
+            "</body></html>"
+        )
+        pages.append((f"synthetic-{n}", html))
+    return pages
+
+
+def load_corpus(paths: list[str]) -> list[tuple[str, str]]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.endswith((".html", ".htm"))
+            )
+        else:
+            files.append(path)
+    corpus = []
+    for path in files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            corpus.append((os.path.basename(path), f.read()))
+    return corpus
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        times.append(time.process_time() - start)
+    return min(times) * 1000
+
+
+if __name__ == "__main__":
+    corpus = load_corpus(sys.argv[1:]) if len(sys.argv) > 1 else synthetic_corpus()
+    url = "https://www.example.com/"
+    backends = available_backends()
+
+    def legacy(html: str):
+        content, links = legacy_extract(BeautifulSoup(html, "html.parser"), url)
+        # The legacy extractor predates fingerprints
+        content["fingerprint"] = simhash(content)
+        return content, links
+
+    header = f"{'page':<28} {'KB':>6} {'legacy ms':>10}"
+    for backend in backends:
+        header += f" {backend + ' ms':>16} {'same':>4}"
+    print(header)
+
+    totals = {name: 0.0 for name in ["legacy", *backends]}
+    for name, html in corpus:
+        expected = legacy(html)
+        legacy_ms = best_of(lambda: legacy(html))
+        totals["legacy"] += legacy_ms
+        row = f"{name[:28]:<28} {len(html) // 1024:>6} {legacy_ms:>10.1f}"
+        for backend in backends:
+            same = parse_page(html, url, backend) == expected
+            ms = best_of(lambda: parse_page(html, url, backend))
+            totals[backend] += ms
+            row += f" {ms:>11.1f} ({legacy_ms / max(ms, 1e-9):>3.1f}x) {'✅' if same else '❌':>3}"
+        print(row)
+
+    if corpus:
+        row = f"{'total':<28} {'':>6} {totals['legacy']:>10.1f}"
+        for backend in backends:
+            row += f" {totals[backend]:>11.1f} ({totals['legacy'] / max(totals[backend], 1e-9):>3.1f}x)    "
+        print(row)
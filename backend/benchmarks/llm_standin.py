@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stand-in for the LLM provider.
+
+Serves POST /v1/chat/completions with canned, deterministic replies for
+every prompt the analysis pipeline sends: page scoring (single and
+batched), the aggregate summary and the AEOReport (single-call and
+formatting prompts), in both structured-output and plain-JSON modes.
+Scores are derived from a hash of each page's prompt block, so the same
+site always gets the same results.
+
+Latency is drawn from a log-normal distribution around --latency-ms plus
+--ms-per-1k-tokens of prompt, and --error-rate / --rate-limit-rate inject
+500 and 429 responses, all from a seeded RNG so runs are reproducible.
+GET /stats returns request counts per prompt kind.
+
+Run from the backend directory, then point the API at it:
+    python -m benchmarks.llm_standin --port 8799 --latency-ms 800 --error-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8799/v1 OPENAI_API_KEY=standin uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from typing import Any, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from api.prompt_budget import count_tokens, load_tokenizer
+
+CATEGORIES = ("content_quality", "structure_optimization", "authority_trust", "ai_agent_compatibility")
+REASONS = {
+    1: "Little usable content for answer engines",
+    2: "Thin content with weak structure",
+    3: "Adequate content; structure and trust signals vary",
+    4: "Clear, well-structured content with good signals",
+    5: "Comprehensive, well-structured and authoritative",
+}
+
+PAGE_BLOCK = re.compile(r"^### Page \d+\n", re.MULTILINE)
+OVERALL_SCORE = re.compile(r"Overall Score: (\d+)")
+SITE_URL = re.compile(r"^URL: (\S+)", re.MULTILINE)
+
+
+def _score(seed_text: str, category: str) -> int:
+    digest = hashlib.sha256(f"{category}\n{seed_text}".encode("utf-8")).digest()
+    return 1 + digest[0] % 5
+
+
+def page_scores(page_text: str) -> Dict[str, Any]:
+    scores = {}
+    for category in CATEGORIES:
+        score = _score(page_text, category)
+        scores[category] = {"score": score, "reason": REASONS[score]}
+    return {"scores": scores}
+
+
+def batch_scores(prompt: str) -> Dict[str, Any]:
+    blocks = PAGE_BLOCK.split(prompt)[1:]
+    return {"results": [{"page": i, **page_scores(block)} for i, block in enumerate(blocks, start=1)]}
+
+
+def report(prompt: str) -> Dict[str, Any]:
+    overall = OVERALL_SCORE.search(prompt)
+    url = SITE_URL.search(prompt)
+    scope = url.group(1) if url else "site"
+    notes = {key: _score(prompt, key) for key in ("content_quality", "structure", "authority_signals", "ai_agent_compatibility")}
+    return {
+        "meta": {
+            "report_title": "AI-optimization Site Report",
+            "scope": scope,
+            "analyzed_at": "2024-01-01T00:00:00Z",
+            "overall_score": int(overall.group(1)) if overall else 50,
+            "analyst": "AI",
+            "tool_version": "1.0",
+        },
+        "executive_summary": {
+            "summary_paragraph": f"Stand-in summary of {scope}: content depth and structure vary across pages.",
+            "highlights": ["Clear navigation", "Some pages lack structured data"],
+        },
+        "overall_findings": {
+            **{key: {"score": score, "notes": REASONS[score]} for key, score in notes.items()},
+            "impact": "Better structure and trust signals should improve answer-engine visibility",
+            "common_themes": ["Inconsistent headings", "Missing FAQ markup"],
+        },
+        "strengths": {
+            "brand_domain_trust": ["Consistent branding"],
+            "navigation_layout": ["Shallow navigation"],
+            "technical_signals": ["Fast pages"],
+        },
+        "weaknesses": {
+            "content_depth": ["Thin category pages"],
+            "authority_trust": ["No author bylines"],
+            "semantic_accessibility": ["Skipped heading levels"],
+            "ux_friction": ["Dense footers"],
+        },
+        "recommendations": [
+            {
+                "priority": "high",
+                "action": "Add FAQ sections with FAQPage markup",
+                "rationale": "Gives answer engines quotable Q&A",
+                "owner": "content",
+                "effort": "M",
+                "impact": "L",
+                "success_metrics": ["Pages with FAQPage schema"],
+            }
+        ],
+        "bottom_line": f"{scope} is a solid base; structured Q&A content is the biggest gap.",
+    }
+
+
+def classify(prompt: str, response_format: Dict[str, Any] | None) -> str:
+    """Which pipeline prompt this is: score, score_batch, report or summary."""
+    schema_name = ((response_format or {}).get("json_schema") or {}).get("name")
+    if schema_name == "BatchScoreResult" or PAGE_BLOCK.search(prompt):
+        return "score_batch"
+    if schema_name == "AEOReport" or "INPUT_REPORT" in prompt:
+        return "report"
+    if schema_name == "PageScoreResult" or "return a strict JSON object with this shape" in prompt:
+        return "score"
+    return "summary"
+
+
+def reply_for(kind: str, prompt: str) -> str:
+    if kind == "score":
+        return json.dumps(page_scores(prompt))
+    if kind == "score_batch":
+        return json.dumps(batch_scores(prompt))
+    if kind == "report":
+        return json.dumps(report(prompt))
+    return "Stand-in aggregate summary: pages share consistent strengths and gaps in structured Q&A content."
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    app = FastAPI(title="LLM stand-in")
+    rng = random.Random(args.seed)
+    counts: Dict[str, int] = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages: List[Dict[str, str]] = body.get("messages") or []
+        # Repair retries append turns; the first user message names the task
+        prompt = messages[0].get("content", "") if messages else ""
+        prompt_tokens = sum(count_tokens(m.get("content") or "") for m in messages)
+        kind = classify(prompt, body.get("response_format"))
+        counts["requests"] += 1
+        counts[kind] = counts.get(kind, 0) + 1
+
+        latency = rng.lognormvariate(0, args.latency_sigma) * args.latency_ms
+        latency += prompt_tokens / 1000 * args.ms_per_1k_tokens
+        roll = rng.random()
+        await asyncio.sleep(latency / 1000)
+
+        if roll < args.rate_limit_rate:
+            counts["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached (stand-in)", "type": "rate_limit_error"}},
+                status_code=429,
+                headers={"retry-after": "1"},
+            )
+        if roll < args.rate_limit_rate + args.error_rate:
+            counts["errors"] += 1
+            return JSONResponse({"error": {"message": "Internal error (stand-in)", "type": "server_error"}}, status_code=500)
+
+        content = reply_for(kind, prompt)
+        completion_tokens = count_tokens(content)
+        return {
+            "id": f"chatcmpl-standin-{counts['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "standin"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return counts
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency-ms", type=float, default=500, help="median base latency per call")
+    parser.add_argument("--latency-sigma", type=float, default=0.3, help="log-normal spread (0 = fixed latency)")
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=100, help="extra latency per 1k prompt tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of calls answered with HTTP 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    # Exact token counts for latency modelling; loaded before serving
+    load_tokenizer()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
@@ -1,12 +1,17 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from api.routers import auth, users, analysis, hire
+from api.routers import auth, users, analysis, hire, metrics
 from fastapi import Body
 from api.models import ContactRequest, MessageResponse
 from api.database import DatabaseService
+from api.fetcher import close_http_client
+from api.parse_pool import shutdown_parse_pool
+from api.llm import close_llm_client
+from api.prompt_budget import warm_tokenizer
 import uuid
 
 # Load environment variables from .env file
@@ -89,6 +94,21 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(analysis.router)
 app.include_router(hire.router)
+app.include_router(metrics.router)
+
+@app.on_event("startup")
+async def startup():
+    """Start background report workers (re-queues unfinished jobs); load the tokenizer off the event loop"""
+    analysis.report_jobs.start()
+    app.state.tokenizer_warmup = asyncio.create_task(warm_tokenizer())
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop report workers; release pooled HTTP/LLM connections and parser worker processes"""
+    await analysis.report_jobs.stop()
+    await close_http_client()
+    await close_llm_client()
+    shutdown_parse_pool()
 
 @app.get("/")
 async def root():
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Checks for crawl URL handling in api.crawler
+canonicalize_url only keys the seen-set; pages are fetched and their links
+resolved against the URL as found. Runs offline: python test_crawler.py
+"""
+
+from api.crawler import CrawlFrontier, canonicalize_url
+from api.extraction import parse_page
+
+
+def test_canonicalize_url():
+    """Trivial variants of a URL share one key"""
+    cases = {
+        "HTTPS://Ex.com:443/blog/": "https://ex.com/blog",
+        "http://ex.com:80": "http://ex.com/",
+        "https://ex.com:8443/a": "https://ex.com:8443/a",
+        "https://ex.com/a#section": "https://ex.com/a",
+        "https://ex.com/a?utm_source=x&b=2&a=1&gclid=y": "https://ex.com/a?a=1&b=2",
+        "https://ex.com/a?flag": "https://ex.com/a?flag=",
+    }
+    for url, expected in cases.items():
+        assert canonicalize_url(url) == expected, (url, canonicalize_url(url))
+    try:
+        canonicalize_url("https://ex.com:99999/")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid port accepted")
+    print("\n✅ canonicalize_url")
+
+
+def test_frontier_keeps_original_urls():
+    """The frontier queues URLs as found and dedups them by canonical key"""
+    frontier = CrawlFrontier("https://ex.com/blog/")
+    assert frontier.add("https://ex.com/blog/post-1/?flag#top")
+    assert not frontier.add("https://ex.com/blog/post-1?flag=")
+    assert not frontier.add("https://ex.com/blog")
+    assert not frontier.add("https://other.example.org/")
+    assert [frontier.pop(), frontier.pop()] == ["https://ex.com/blog/", "https://ex.com/blog/post-1/?flag"]
+    print("\n✅ Frontier keeps original URLs")
+
+
+def test_relative_links():
+    """Relative links resolve against the page URL, trailing slash included"""
+    html = """<html><head><title>Blog</title></head><body>
+<a href="post-1/">Post</a>
+<a href="../about">About</a>
+<a href="?page=2">Next</a>
+</body></html>"""
+    _, links = parse_page(html, "https://ex.com/blog/", "html.parser")
+    assert links == [
+        "https://ex.com/blog/post-1/",
+        "https://ex.com/about",
+        "https://ex.com/blog/?page=2",
+    ], links
+    print("\n✅ Relative links")
+
+
+def main():
+    print("🚀 Crawler URL handling")
+    print("=" * 50)
+    test_canonicalize_url()
+    test_frontier_keeps_original_urls()
+    test_relative_links()
+    print("\n✅ Crawler checks completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Parity checks for the HTML parser backends in api.extraction
+Every installed backend must produce the same (content, links) as html.parser
+on well-formed pages. Runs offline: python test_parser_parity.py
+"""
+
+from api.extraction import available_backends, parse_page, resolve_backend
+
+URL = "https://www.example.com/guides/start"
+
+FIXTURES = {
+    "article_jsonld_graph": """<!DOCTYPE html>
+<html><head>
+<title>Getting started &amp; setup</title>
+<meta name="description" content="How to get started">
+<meta property="og:title" content="Getting started">
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "Article", "headline": "Getting started"},
+  {"@type": ["BreadcrumbList", "ItemList"]},
+  {"@type": "Organization", "name": "Example"}
+]}
+</script>
+</head><body>
+<h1>Getting <em>started</em></h1>
+<p>First paragraph with <a href="/docs/install?utm_source=news">an install link</a>.</p>
+<h2>Next steps</h2>
+<p>Caf&eacute; &lt;tags&gt; &mdash; entities&nbsp;decode.</p>
+</body></html>""",
+    "faq_page": """<html><head><title>FAQ</title>
+<script type="application/ld+json">{"@type": "FAQPage", "mainEntity": []}</script>
+<script type="application/ld+json">not json</script>
+</head><body>
+<h2>What is it?</h2><p>An answer.</p>
+<h2>How much?</h2><p>Free.</p>
+<ul><li>One</li><li>Two <b>bold</b></li></ul>
+</body></html>""",
+    "nav_heavy": "<html><head><title>Nav</title></head><body><nav><ul>"
+    + "".join(
+        f'<li><a href="/s{i}/"><span>Section {i}</span></a><ul><li><a href="/s{i}/sub">Sub {i}</a></li></ul></li>'
+        for i in range(60)
+    )
+    + "</ul></nav></body></html>",
+    "duplicate_meta": """<html><head><title>Meta</title>
+<meta name="description" content="first">
+<meta name="keywords" content="a, b">
+<meta name="description" content="second">
+<meta name="empty" content="">
+<meta content="no name">
+</head><body><p>Body</p></body></html>""",
+    "script_inside_p": """<html><head><title>Scripts</title><style>p { color: red; }</style></head>
+<body><p>Visible <script>var hidden = 1;</script>text</p>
+<li>Item <style>.x{}</style>one</li>
+<a href="/x">Link <script>track()</script>text</a></body></html>""",
+    "link_edge_cases": """<html><head><title>Links</title></head><body>
+<a href>Valueless</a>
+<a href="">Empty</a>
+<a>No href</a>
+<a href="mailto:hi@example.com">Mail</a>
+<a href="javascript:void(0)">JS</a>
+<a href="https://other.example.org/page#frag">External</a>
+<a href="../up">Relative</a>
+</body></html>""",
+    "no_title": "<html><body><h3>Only a heading</h3></body></html>",
+}
+
+
+def check_fixture(name: str, html: str) -> bool:
+    expected = parse_page(html, URL, "html.parser")
+    ok = True
+    for backend in available_backends():
+        actual = parse_page(html, URL, backend)
+        if actual == expected:
+            print(f"   ✅ {name} [{backend}]")
+        else:
+            ok = False
+            print(f"   ❌ {name} [{backend}]")
+            print(f"      expected: {expected}")
+            print(f"      actual:   {actual}")
+    return ok
+
+
+def test_backend_parity():
+    """All installed backends agree with html.parser on every fixture"""
+    print("\n🔍 Parser parity:")
+    results = [check_fixture(name, html) for name, html in FIXTURES.items()]
+    assert all(results)
+
+
+def test_expected_fields():
+    """Spot-check extracted values so parity is not trivially empty"""
+    content, links = parse_page(FIXTURES["article_jsonld_graph"], URL, "html.parser")
+    assert content["title"] == "Getting started & setup"
+    assert content["headings"] == ["Gettingstarted", "Next steps"]
+    assert content["jsonld_types"] == ["Article", "BreadcrumbList", "ItemList", "Organization"]
+    assert content["meta"]["og:title"] == "Getting started"
+    assert links == ["https://www.example.com/docs/install?utm_source=news"]
+
+    content, _ = parse_page(FIXTURES["duplicate_meta"], URL, "html.parser")
+    assert content["meta"] == {"description": "second", "keywords": "a, b"}
+
+    content, _ = parse_page(FIXTURES["script_inside_p"], URL, "html.parser")
+    assert content["paragraphs"] == ["Visibletext"]
+
+    content, _ = parse_page(FIXTURES["nav_heavy"], URL, "html.parser")
+    assert len(content["lists"]) == 12 and len(content["links_text"]) == 30
+    print("\n✅ Expected fields")
+
+
+def test_resolve_backend():
+    """Unknown or missing backends fall back to the fastest installed one"""
+    available = available_backends()
+    assert available[-1] == "html.parser"
+    assert resolve_backend("auto") == available[0]
+    assert resolve_backend("no-such-parser") == available[0]
+    for backend in available:
+        assert resolve_backend(backend) == backend
+    print("\n✅ Backend resolution:", ", ".join(available))
+
+
+def main():
+    print("🚀 Parser backend parity")
+    print("=" * 50)
+    test_resolve_backend()
+    test_expected_fields()
+    test_backend_parity()
+    print("\n✅ Parity checks completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -901,6 +901,22 @@ function App() {
     }
   };
 
+  // The report is built by a background job; until it is ready the
+  // endpoint answers 202 with the job status, so poll until it arrives
+  const fetchReport = async (id) => {
+    for (let attempt = 0; attempt < 150; attempt++) {
+      const data = await apiCall(`/report/${id}`);
+      if (data?.meta) {
+        return data;
+      }
+      if (data?.status === 'failed') {
+        throw new Error(data.error || 'Report generation failed');
+      }
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+    }
+    throw new Error('Report is taking longer than expected. Please try again.');
+  };
+
   // Step 4: Handle email verification
   const handleVerifyEmail = async (code) => {
     setLoading(true);
@@ -911,7 +927,7 @@ function App() {
       setSuccess('Email verified! Generating your report...');
       
       // Fetch the detailed report (now includes page_results and summary)
-      const report = await apiCall(`/report/${analysisId}`);
+      const report = await fetchReport(analysisId);
       setReportData(report);
       setCurrentStep('detailedReport');
     } catch (err) {